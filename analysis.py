@@ -0,0 +1,121 @@
+import os
+import time
+from collections import deque
+from itertools import islice
+
+from strategies.minmax_strategy import MinmaxStrategy, DEPTH
+
+# Strategy used by the current worker process, created once so its caches are shared by all the positions
+# the worker analyzes
+_worker_strategy = None
+
+
+def _initialize_worker():
+    """
+    Creates the strategy of a worker process
+    """
+    global _worker_strategy
+    _worker_strategy = MinmaxStrategy()
+
+
+def _analyze_position(position, depth, number_of_candidates):
+    """
+    Analyzes one position in a worker process
+    :param position: tuple (Board object, Player.WHITE or Player.BLACK)
+    :param depth: integer, search depth
+    :param number_of_candidates: optional integer, maximum number of candidates returned
+    :return: list of (move, score, principal variation) tuples, as returned by MinmaxStrategy.analyze
+    """
+    board, player_colour = position
+    return _worker_strategy.analyze(board, player_colour, depth, number_of_candidates)
+
+
+class BatchAnalyzer:
+    """
+    Class that analyzes many positions over a pool of worker processes
+    """
+    def __init__(self, workers=None, depth=DEPTH, number_of_candidates=None, chunk_size=4):
+        """
+        Initializes the analyzer
+        :param workers: optional integer, number of worker processes, defaults to the number of processors
+        :param depth: integer, search depth used for every position
+        :param number_of_candidates: optional integer, maximum number of candidates returned for every position
+        :param chunk_size: integer, number of positions waiting or being analyzed for each worker, so that
+                           at most workers * chunk_size positions are read from the input at any time
+        """
+        self._workers = workers
+        self._depth = depth
+        self._number_of_candidates = number_of_candidates
+        self._chunk_size = chunk_size
+
+        self._positions_analyzed = 0
+        self._elapsed_time = 0.0
+
+    @property
+    def positions_analyzed(self):
+        return self._positions_analyzed
+
+    @property
+    def positions_per_second(self):
+        """
+        Getter, throughput of the analyses done so far. Only the time spent in analyze counts,
+        not the time the caller spends between two results
+        :return: float, number of positions analyzed per second
+        """
+        if self._elapsed_time == 0:
+            return 0.0
+        return self._positions_analyzed / self._elapsed_time
+
+    def analyze(self, positions):
+        """
+        Analyzes the positions and yields the results as soon as they are available, in the input order.
+        The positions are read lazily: a new one is submitted each time a result is yielded, so the input may
+        be a generator of any length. The given boards are not modified
+        :param positions: iterable of (Board object, player at move) tuples
+        :return: generator of lists of (move, score, principal variation) tuples, one list for each position
+        """
+        # Imported here so that importing this module stays cheap for the worker processes
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Start of the time counted since the generator last resumed
+        start_time = time.perf_counter()
+
+        workers = self._workers or os.cpu_count() or 1
+        positions = iter(positions)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker) as executor:
+            # Futures of the positions in flight, the oldest first
+            pending = deque(self._submit(executor, position)
+                            for position in islice(positions, workers * self._chunk_size))
+            try:
+                while pending:
+                    result = pending.popleft().result()
+                    for position in islice(positions, 1):
+                        pending.append(self._submit(executor, position))
+
+                    self._positions_analyzed += 1
+                    self._elapsed_time += time.perf_counter() - start_time
+                    yield result
+                    start_time = time.perf_counter()
+            finally:
+                # The caller stopped reading the results, so the positions not started yet are dropped
+                for future in pending:
+                    future.cancel()
+
+    def _submit(self, executor, position):
+        """
+        Sends one position to the worker processes
+        :param executor: ProcessPoolExecutor object
+        :param position: tuple (Board object, player at move)
+        :return: Future object of the analysis
+        """
+        return executor.submit(_analyze_position, position, self._depth, self._number_of_candidates)
+
+    def report(self):
+        """
+        Returns a one line description of the throughput
+        :return: string
+        """
+        return 'Analyzed ' + str(self._positions_analyzed) + ' positions, ' + \
+               '{:.2f}'.format(self.positions_per_second) + ' positions per second'
+
@@ -1,6 +1,8 @@
-from texttable import Texttable
-
 from constants import Player, row_change, col_change
+from rules import RULES, LINE_REACH
+
+# For every board size, the line of every cell in each of the first 4 directions, as returned by _get_line_positions
+_line_positions = {}
 
 
 class Board:
@@ -8,14 +10,16 @@ class Board:
     Class that manages the Gomoku board
     """
 
-    def __init__(self, board_size, previous_data=None):
+    def __init__(self, board_size, previous_data=None, rules=None):
         """
         Initializes the Gomoku Board
         :param board_size: integer
         :param previous_data: if the board is a duplicate of another board, this is a matrix
                               with previous board data. This is copied to prevent shallow copy problems
+        :param rules: Rules object deciding the winning lines and the forbidden moves, freestyle by default
         """
         self._board_size = board_size
+        self._rules = rules if rules is not None else RULES['freestyle']
         self._board_winner = Player.NONE
         self._last_move_line = None
         self._last_move_column = None
@@ -26,10 +30,19 @@ class Board:
         else:
             self._data = [[Player.NONE for j in range(self._board_size)] for i in range(self._board_size)]
 
+        # Bitsets of the black and white pieces of every line, indexed by direction and line, built on first use
+        # and then updated by every move, so that reading the cells around a move never rescans the board
+        self._black_lines = None
+        self._white_lines = None
+
     @property
     def board_size(self):
         return self._board_size
 
+    @property
+    def rules(self):
+        return self._rules
+
     @property
     def board_winner(self):
         return self._board_winner
@@ -46,6 +59,20 @@ class Board:
     def data(self):
         return self._data
 
+    def __getstate__(self):
+        """
+        The rules are pickled by name, so that a pickled board does not carry the caches of its rules
+        and the unpickled board uses the process-wide rules object again
+        :return: dictionary
+        """
+        state = dict(self.__dict__)
+        state['_rules'] = self._rules.name
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._rules = RULES[state['_rules']]
+
     def get_cell_value(self, row, column):
         """
         Gets the value at row and column
@@ -64,6 +91,87 @@ class Board:
         """
         return self.get_cell_value(row, column) == Player.NONE
 
+    def is_move_allowed(self, row, column, player_colour):
+        """
+        Checks if the player can place a piece at row and column: the cell must be empty
+        and the rules must not forbid the move
+        :param row: integer in range [0, board size-1]
+        :param column: integer in range [0, board size-1]
+        :param player_colour: Player.WHITE or Player.BLACK
+        :return: True if the move can be made and False otherwise
+        """
+        return self.is_cell_empty(row, column) and not self._rules.is_forbidden(self, row, column, player_colour)
+
+    def copy(self):
+        """
+        Returns a board with the same pieces and rules, keeping the line bitsets if they are built
+        :return: Board object
+        """
+        board = Board(self._board_size, self._data, self._rules)
+        if self._black_lines is not None:
+            board._black_lines = [list(lines) for lines in self._black_lines]
+            board._white_lines = [list(lines) for lines in self._white_lines]
+        return board
+
+    def get_line_bits(self, row, column, direction):
+        """
+        Reads the LINE_REACH cells on each side of a cell, in one of the first 4 directions
+        :param row: integer in range [0, board size-1]
+        :param column: integer in range [0, board size-1]
+        :param direction: integer in range [0, 3], as in row_change and col_change
+        :return: tuple (black bits, white bits) of 2 * LINE_REACH + 1 bits, bit i being the cell i - LINE_REACH
+                 cells away in the direction. Cells outside the board are white bits
+        """
+        if self._black_lines is None:
+            self._build_lines()
+
+        line, position = _get_line_positions(self._board_size)[direction][row][column]
+        mask = (1 << (2 * LINE_REACH + 1)) - 1
+        return (self._black_lines[direction][line] >> position) & mask, \
+            (self._white_lines[direction][line] >> position) & mask
+
+    def _build_lines(self):
+        """
+        Builds the line bitsets from the board data
+        """
+        line_positions = _get_line_positions(self._board_size)
+        self._black_lines, self._white_lines = [], []
+
+        for direction in range(4):
+            lengths = {}
+            for row in range(self._board_size):
+                for column in range(self._board_size):
+                    line, position = line_positions[direction][row][column]
+                    lengths[line] = max(lengths.get(line, 0), position + 1)
+
+            # The bits past both ends of a line are outside the board, so they are white bits
+            self._black_lines.append([0] * len(lengths))
+            self._white_lines.append([((1 << (lengths[line] + 2 * LINE_REACH)) - 1) ^
+                                      (((1 << lengths[line]) - 1) << LINE_REACH) for line in range(len(lengths))])
+
+        for row in range(self._board_size):
+            for column in range(self._board_size):
+                self._update_lines(row, column)
+
+    def _update_lines(self, row, column):
+        """
+        Updates the line bitsets through a cell to its current value
+        :param row: integer in range [0, board size-1]
+        :param column: integer in range [0, board size-1]
+        """
+        value = self._data[row][column]
+        line_positions = _get_line_positions(self._board_size)
+
+        for direction in range(4):
+            line, position = line_positions[direction][row][column]
+            bit = 1 << (position + LINE_REACH)
+            self._black_lines[direction][line] &= ~bit
+            self._white_lines[direction][line] &= ~bit
+            if value == Player.BLACK:
+                self._black_lines[direction][line] |= bit
+            elif value == Player.WHITE:
+                self._white_lines[direction][line] |= bit
+
     def get_filled_cells(self):
         """
         Returns a list of tuples (row,column) that already have a piece placed
@@ -81,6 +189,8 @@ class Board:
         :param player_colour: Player.WHITE or Player.BLACK
         """
         self._data[row][column] = player_colour
+        if self._black_lines is not None:
+            self._update_lines(row, column)
         self._number_of_empty_cells -= 1
         self._last_move_line, self._last_move_column = row, column
         self._check_for_winner()
@@ -94,6 +204,8 @@ class Board:
         :return:
         """
         self._data[row][column] = player_colour
+        if self._black_lines is not None:
+            self._update_lines(row, column)
 
     def are_coordinates_valid(self, row, column):
         """
@@ -107,22 +219,26 @@ class Board:
     def _check_for_winner(self):
         """
         Checks if there is a winner in the current board placement.
+        Only the lines through the last move are checked, the rules deciding which lengths win.
         If there is a winner, it is marked in the "self._board_winner" attribute of the board.
         """
+        row, column = self._last_move_line, self._last_move_column
+        player_colour = self.get_cell_value(row, column)
+
         for direction in range(4):
-            row, column = self._last_move_line, self._last_move_column
             line = self.get_line_of_characters(row, column, direction, must_be_the_same=True)
 
-            if 'W' * 5 in line:
-                self._board_winner = Player.WHITE
-            elif 'B' * 5 in line:
-                self._board_winner = Player.BLACK
+            if self._rules.is_five(len(line), player_colour):
+                self._board_winner = player_colour
 
     def __str__(self):
         """
         Returns string representation of the table in Texttable format
+        Texttable is imported here so that the engine can be used without it
         :return: string
         """
+        from texttable import Texttable
+
         t = Texttable()
 
         t.header([' '] + [str(i) for i in range(self.board_size)])
@@ -195,3 +311,35 @@ class Board:
             return 'W'
         else:
             return ' '
+
+
+def _get_line_positions(board_size):
+    """
+    Numbers the lines of a board in each of the first 4 directions, once for every board size
+    :param board_size: integer
+    :return: list indexed by direction, row and column of (line index, position of the cell along the line)
+             tuples, positions growing in the direction
+    """
+    if board_size not in _line_positions:
+        positions = []
+        for direction in range(4):
+            line_indices = {}
+            cells = [[None] * board_size for _ in range(board_size)]
+
+            for row in range(board_size):
+                for column in range(board_size):
+                    # The line is identified by its first cell, found by walking against the direction
+                    start_row, start_column, position = row, column, 0
+                    while 0 <= start_row - row_change[direction] < board_size and \
+                            0 <= start_column - col_change[direction] < board_size:
+                        start_row -= row_change[direction]
+                        start_column -= col_change[direction]
+                        position += 1
+
+                    line = line_indices.setdefault((start_row, start_column), len(line_indices))
+                    cells[row][column] = (line, position)
+
+            positions.append(cells)
+        _line_positions[board_size] = positions
+
+    return _line_positions[board_size]
@@ -0,0 +1,55 @@
+class BoundedCache:
+    """
+    Dictionary with a maximum number of entries, used by all the engine caches and tables.
+    When it is full, adding a new key evicts the oldest entry, so the memory used never grows past the bound
+    """
+    def __init__(self, max_entries):
+        """
+        Initializes an empty cache
+        :param max_entries: integer, maximum number of entries kept
+        """
+        self._max_entries = max(1, max_entries)
+        self._entries = {}
+
+    @property
+    def max_entries(self):
+        return self._max_entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getitem__(self, key):
+        return self._entries[key]
+
+    def __setitem__(self, key, value):
+        if key not in self._entries and len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = value
+
+    def resize(self, max_entries):
+        """
+        Changes the maximum number of entries, evicting the oldest entries that do not fit any more
+        :param max_entries: integer
+        """
+        self._max_entries = max(1, max_entries)
+        while len(self._entries) > self._max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def get(self, key, default=None):
+        return self._entries.get(key, default)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def entries_for_memory(memory_limit, entry_size):
+    """
+    Converts a memory budget to a number of cache entries
+    :param memory_limit: integer, number of bytes the cache may use
+    :param entry_size: integer, estimated number of bytes of one entry, including the key and the value
+    :return: integer, at least 1
+    """
+    return max(1, memory_limit // entry_size)
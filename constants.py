@@ -5,6 +5,7 @@ BOARD_SIZE = 11
 WHITE = "#FFFFFF"
 BLACK = "#000000"
 GRAY = "#222222"
+BOARD_COLOUR = "#6B4429"
 
 row_change = [-1, -1, 0, 1, 1, 1, 0, -1]
 col_change = [0, 1, 1, 1, 0, -1, -1, -1]
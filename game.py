@@ -6,19 +6,23 @@ class Game:
     """
     Class that manages the game actions
     """
-    def __init__(self, strategy):
+    def __init__(self, strategy, rules=None, board_size=BOARD_SIZE):
         """
         Initializes the game
         :param strategy: class that implements Strategy abstract class
+        :param rules: Rules object, freestyle by default
+        :param board_size: integer, number of rows and columns of the board
         """
-        self._board = Board(BOARD_SIZE)
+        self._rules = rules
+        self._board_size = board_size
+        self._board = Board(board_size, rules=rules)
         self._strategy = strategy
 
     def restart(self):
         """
         Makes a new empty board
         """
-        self._board = Board(BOARD_SIZE)
+        self._board = Board(self._board_size, rules=self._rules)
 
     def human_move(self, line, column, player_colour):
         """
@@ -28,6 +32,7 @@ class Game:
         :param player_colour: Player.WHITE or Player.BLACK
         Raises ValueError if line or column ar not in valid range
         Raises ValueError if the cell is not empty
+        Raises ValueError if the rules forbid the move
         """
         if not 0 <= line < self.board.board_size:
             raise ValueError('Line value out of range!')
@@ -38,6 +43,9 @@ class Game:
         if not self.board.is_cell_empty(line, column):
             raise ValueError('Cell not empty!')
 
+        if self.board.rules.is_forbidden(self.board, line, column, player_colour):
+            raise ValueError('Forbidden move!')
+
         self.board.set(line, column, player_colour)
 
     def computer_move(self, player_colour):
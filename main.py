@@ -1,9 +1,16 @@
+import sys
+
+from rules import RULES
 from strategies.minmax_strategy import MinmaxStrategy
 from strategies.random_strategy import RandomStrategy
-from ui.gui import GUI
-from ui.ui import UI
 
 if __name__ == '__main__':
+    if '--protocol' in sys.argv:
+        # Driven by a tournament manager on stdin and stdout, so nothing else may be printed
+        from ui.protocol import Protocol
+        Protocol().run()
+        sys.exit()
+
     print('\n\n------- GOMOKAI -------')
 
     strategy = interface = None
@@ -14,11 +21,29 @@ if __name__ == '__main__':
         elif strategy_choice == '2':
             strategy = MinmaxStrategy()
 
+    if '--memory' in sys.argv:
+        # Prints the memory used by every computer move
+        from strategies.profiled_strategy import ProfiledStrategy
+        strategy = ProfiledStrategy(strategy)
+
+    rules = None
+    while rules is None:
+        rules_choice = input('Rules (1 - freestyle, 2 - standard or 3 - renju): ')
+        if rules_choice == '1':
+            rules = RULES['freestyle']
+        elif rules_choice == '2':
+            rules = RULES['standard']
+        elif rules_choice == '3':
+            rules = RULES['renju']
+
     while interface is None:
         ui_choice = input('User interface (1 - console or 2 - GUI): ')
+        # The interfaces are imported only when chosen, so pygame is not loaded for the console
         if ui_choice == '1':
-            interface = UI(strategy)
+            from ui.ui import UI
+            interface = UI(strategy, rules)
         elif ui_choice == '2':
-            interface = GUI(strategy)
+            from ui.gui import GUI
+            interface = GUI(strategy, rules)
 
     interface.start()
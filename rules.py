@@ -0,0 +1,209 @@
+from abc import ABC
+
+from cache import BoundedCache, entries_for_memory
+from constants import Player
+
+# Number of cells read on each side of a move, enough to see a four, the five it makes and the cell after it
+LINE_REACH = 6
+CENTER = LINE_REACH
+# Maximum number of line shapes kept by RenjuRules, until set_memory_limit is called, and estimated bytes of one
+LINE_SHAPES_SIZE = 50000
+LINE_SHAPE_ENTRY_SIZE = 240
+
+
+class Rules(ABC):
+    """
+    Base class of the rule variants, deciding which lines win and which moves are forbidden
+    """
+    name = None
+
+    def is_five(self, length, player_colour):
+        """
+        Checks if a line of consecutive pieces wins the game
+        :param length: integer, number of consecutive pieces of the player
+        :param player_colour: Player.WHITE or Player.BLACK
+        :return: boolean value
+        """
+        return length >= 5
+
+    def is_forbidden(self, board, row, column, player_colour):
+        """
+        Checks if the player is not allowed to place a piece at row and column
+        :param board: Board object, row and column being an empty cell
+        :param row: integer in range [0, board size-1]
+        :param column: integer in range [0, board size-1]
+        :param player_colour: Player.WHITE or Player.BLACK
+        :return: boolean value
+        """
+        return False
+
+    def set_memory_limit(self, memory_limit):
+        """
+        Sets the number of bytes the caches of the rules may use
+        :param memory_limit: integer
+        """
+        pass
+
+
+class FreestyleRules(Rules):
+    """
+    Five or more pieces in a row win, there are no forbidden moves
+    """
+    name = 'freestyle'
+
+
+class StandardRules(Rules):
+    """
+    Exactly five pieces in a row win, an overline does not win for either player
+    """
+    name = 'standard'
+
+    def is_five(self, length, player_colour):
+        return length == 5
+
+
+class RenjuRules(Rules):
+    """
+    Black wins with exactly five and may not make an overline, a double four or a double three.
+    White wins with five or more and has no forbidden moves.
+    The lines through a move are classified from the cells at most LINE_REACH cells away, read with one shift
+    from the line bitsets the board updates on every move. The classification of every distinct line is kept,
+    so checking a move is four bitset reads and four dictionary lookups
+    """
+    name = 'renju'
+
+    def __init__(self):
+        # Maps the (black bits, white bits) of a line around a move to (is five, is overline, number of fours,
+        # is open three)
+        self._line_shapes = BoundedCache(LINE_SHAPES_SIZE)
+
+    def is_five(self, length, player_colour):
+        return length == 5 if player_colour == Player.BLACK else length >= 5
+
+    def set_memory_limit(self, memory_limit):
+        self._line_shapes.resize(entries_for_memory(memory_limit, LINE_SHAPE_ENTRY_SIZE))
+
+    def is_forbidden(self, board, row, column, player_colour):
+        if player_colour != Player.BLACK:
+            return False
+
+        has_overline = False
+        fours = threes = 0
+        for direction in range(4):
+            is_five, is_overline, line_fours, is_open_three = self.get_line_shape(board, row, column, direction)
+            if is_five:
+                # Making five wins, even when the move also makes forbidden shapes
+                return False
+            has_overline = has_overline or is_overline
+            fours += line_fours
+            threes += is_open_three
+
+        return has_overline or fours >= 2 or threes >= 2
+
+    def get_line_shape(self, board, row, column, direction):
+        """
+        Classifies the line made by placing a black piece at row and column, in one direction
+        :param board: Board object
+        :param row: integer in range [0, board size-1]
+        :param column: integer in range [0, board size-1]
+        :param direction: integer in range [0, 3]
+        :return: tuple (is five, is overline, number of fours, is open three)
+        """
+        key = board.get_line_bits(row, column, direction)
+        if key not in self._line_shapes:
+            black, white = key
+            line = ''.join('X' if index == CENTER or black >> index & 1 else 'O' if white >> index & 1 else ' '
+                           for index in range(2 * LINE_REACH + 1))
+            self._line_shapes[key] = classify_line(line)
+        return self._line_shapes[key]
+
+
+def classify_line(line):
+    """
+    Classifies a line of characters for Black, the move being the middle character.
+    A four is a line that one more piece turns into exactly five; a straight four, which can be completed
+    at both ends, counts as one four. An open three is a line that one more piece turns into a straight four
+    :param line: string of 2 * LINE_REACH + 1 characters, 'X' for black pieces, 'O' for white pieces or
+                 cells outside the board and ' ' for empty cells
+    :return: tuple (is five, is overline, number of fours, is open three)
+    """
+    length = _run_length(line, CENTER)
+    if length >= 5:
+        return length == 5, length > 5, 0, False
+
+    completions = _five_completions(line)
+    if completions:
+        return False, False, _count_fours(completions), False
+
+    for index, character in enumerate(line):
+        if character == ' ':
+            if _is_straight_four(_five_completions(line[:index] + 'X' + line[index + 1:])):
+                return False, False, 0, True
+
+    return False, False, 0, False
+
+
+def _run_length(line, index):
+    """
+    Counts the consecutive 'X' characters through index
+    :param line: string
+    :param index: integer, position of an 'X' character
+    :return: integer
+    """
+    start = end = index
+    while start > 0 and line[start - 1] == 'X':
+        start -= 1
+    while end < len(line) - 1 and line[end + 1] == 'X':
+        end += 1
+    return end - start + 1
+
+
+def _five_completions(line):
+    """
+    Finds the empty cells that make exactly five together with the middle piece
+    :param line: string of 'X', 'O' and ' ' characters
+    :return: sorted list of indices
+    """
+    completions = []
+    for index, character in enumerate(line):
+        if character != ' ' or abs(index - CENTER) > 4:
+            continue
+
+        # The cells between the move and the completing cell must be black, so the five contains the move
+        between = line[min(index, CENTER) + 1:max(index, CENTER)]
+        if 'O' not in between and ' ' not in between and \
+                _run_length(line[:index] + 'X' + line[index + 1:], index) == 5:
+            completions.append(index)
+
+    return completions
+
+
+def _is_straight_four(completions):
+    """
+    Checks if the completions are the two ends of four consecutive pieces
+    :param completions: sorted list of indices, as returned by _five_completions
+    :return: boolean value
+    """
+    return len(completions) == 2 and completions[1] - completions[0] == 5
+
+
+def _count_fours(completions):
+    """
+    Counts the fours given by the cells that complete five
+    :param completions: sorted list of indices, as returned by _five_completions
+    :return: integer
+    """
+    return 1 if _is_straight_four(completions) else len(completions)
+
+
+RULES = {rules.name: rules for rules in [FreestyleRules(), StandardRules(), RenjuRules()]}
+
+
+def set_memory_limit(memory_limit):
+    """
+    Sets the number of bytes the caches of the rules may use. The rules objects are shared by all the games and
+    strategies of the process, so this is meant to be called once, by whoever owns the process memory budget
+    :param memory_limit: integer
+    """
+    for rules in RULES.values():
+        rules.set_memory_limit(memory_limit)
@@ -0,0 +1,275 @@
+import time
+
+from cache import BoundedCache
+from constants import BOARD_SIZE, Player
+from rules import FreestyleRules
+
+# Possible results of a solved position, for the player at move
+WIN, LOSS, DRAW, UNKNOWN = 'win', 'loss', 'draw', 'unknown'
+
+# The solver is used when the board has at most this many empty cells,
+# or when at most this many five cell windows can still be completed by a player
+EMPTY_CELLS_THRESHOLD = 20
+LIVE_WINDOWS_THRESHOLD = 12
+# Maximum number of nodes expanded and seconds spent for one position, so that solving never takes much
+# longer than a search. Both proofs made by solve share them
+NODE_LIMIT = 5000
+TIME_LIMIT = 0.1
+# Maximum number of positions kept in the table, the oldest ones being evicted first
+TABLE_SIZE = 100000
+# Estimated number of bytes used by one table entry
+TABLE_ENTRY_SIZE = 300
+
+PROOF_INFINITY = 10 ** 9
+LINE_DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+class _LimitReached(Exception):
+    pass
+
+
+class EndgameSolver:
+    """
+    Exact solver for positions with few empty cells or few lines left to play for.
+    Uses depth-first proof-number search on positions encoded as two integer bitsets, one for each player.
+    Only the empty cells of windows that a player can still complete are played, since the other cells
+    can not change the result
+    """
+    def __init__(self, board_size=BOARD_SIZE, node_limit=NODE_LIMIT, table_size=TABLE_SIZE, time_limit=TIME_LIMIT):
+        """
+        Initializes the solver and precomputes the masks of all the five cell windows
+        :param board_size: integer
+        :param node_limit: integer, maximum number of nodes expanded for one position
+        :param table_size: integer, maximum number of positions kept in the table
+        :param time_limit: float, maximum number of seconds spent on one position
+        """
+        self._board_size = board_size
+        self._node_limit = node_limit
+        self._time_limit = time_limit
+        self._nodes = 0
+        self._deadline = None
+
+        # Maps (attacker bits, defender bits, is attacker at move) to (proof number, disproof number)
+        self._table = BoundedCache(table_size)
+
+        # Rows are one bit wider than the board, so that the empty bit stops lines wrapping to the next row
+        self._width = board_size + 1
+        self._windows = []
+        self._windows_by_cell = {}
+        for row in range(board_size):
+            for column in range(board_size):
+                for row_step, column_step in LINE_DIRECTIONS:
+                    cells = [(row + index * row_step, column + index * column_step) for index in range(5)]
+                    if all(0 <= cell_row < board_size and 0 <= cell_column < board_size
+                           for cell_row, cell_column in cells):
+                        window = 0
+                        for cell in cells:
+                            window |= self.cell_bit(*cell)
+                        self._windows.append(window)
+                        for cell in cells:
+                            self._windows_by_cell.setdefault(self.cell_bit(*cell), []).append(window)
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def table_size(self):
+        return len(self._table)
+
+    def set_table_size(self, table_size):
+        """
+        Changes the maximum number of positions kept in the table
+        :param table_size: integer
+        """
+        self._table.resize(table_size)
+
+    def cell_bit(self, row, column):
+        """
+        Returns the bit of a cell in the position bitsets
+        :param row: integer in range [0, board size - 1]
+        :param column: integer in range [0, board size - 1]
+        :return: integer with one bit set
+        """
+        return 1 << (row * self._width + column)
+
+    def encode(self, board):
+        """
+        Encodes a board as two bitsets
+        :param board: Board object
+        :return: tuple (black bits, white bits)
+        """
+        black = white = 0
+        for row, column in board.get_filled_cells():
+            if board.get_cell_value(row, column) == Player.BLACK:
+                black |= self.cell_bit(row, column)
+            else:
+                white |= self.cell_bit(row, column)
+        return black, white
+
+    def count_live_windows(self, black, white):
+        """
+        Counts the five cell windows that a player can still complete
+        :param black: integer, black bits
+        :param white: integer, white bits
+        :return: integer
+        """
+        return sum(1 for window in self._windows if not window & black or not window & white)
+
+    def is_applicable(self, board):
+        """
+        Checks if the position is small enough to be solved.
+        The solver only knows freestyle rules, where any five or more pieces win and no move is forbidden,
+        and the board size it was made for
+        :param board: Board object
+        :return: True if there are few empty cells or few windows left to play for
+        """
+        if not isinstance(board.rules, FreestyleRules) or board.board_size != self._board_size:
+            return False
+
+        empty_cells = board.board_size * board.board_size - len(board.get_filled_cells())
+        if empty_cells <= EMPTY_CELLS_THRESHOLD:
+            return True
+
+        return self.count_live_windows(*self.encode(board)) <= LIVE_WINDOWS_THRESHOLD
+
+    def solve(self, board, player_colour, deadline=None):
+        """
+        Tries to prove the result of the position for the player at move, within the node and time limits.
+        First tries to prove a win, then tries to prove that the other player can not win, which is a draw
+        :param board: Board object, left unchanged
+        :param player_colour: Player.WHITE or Player.BLACK, the player at move
+        :param deadline: optional float, time.perf_counter() value after which the solver gives up,
+                         when it comes before the end of the time limit
+        :return: tuple (WIN, LOSS, DRAW or UNKNOWN, (row,column) of a move keeping that result or None).
+                 No move is returned for LOSS and UNKNOWN, nor when the board is full
+        """
+        black, white = self.encode(board)
+        own, other = (black, white) if player_colour == Player.BLACK else (white, black)
+        self._deadline = time.perf_counter() + self._time_limit
+        if deadline is not None:
+            self._deadline = min(self._deadline, deadline)
+
+        try:
+            is_win, move = self._prove(own, other, True)
+            if is_win:
+                return WIN, move
+
+            is_loss, move = self._prove(other, own, False)
+            if is_loss:
+                return LOSS, None
+        except _LimitReached:
+            return UNKNOWN, None
+
+        if move is None:
+            # No window can be completed any more, so every move draws
+            empty_cells = [(row, column) for row in range(board.board_size) for column in range(board.board_size)
+                           if board.is_cell_empty(row, column)]
+            move = empty_cells[0] if empty_cells else None
+        return DRAW, move
+
+    def _prove(self, attacker, defender, is_attacker_to_move):
+        """
+        Runs the proof-number search until the attacker win is proven or disproven
+        :param attacker: integer, bits of the player trying to win
+        :param defender: integer, bits of the other player
+        :param is_attacker_to_move: Boolean
+        :return: tuple (True if the attacker wins and False otherwise, (row,column) of the root move
+                 that decides the result, or None if there are no moves left)
+        Raises _LimitReached if the node limit or the deadline is reached first
+        """
+        self._nodes = 0
+        bit = self._search(attacker, defender, is_attacker_to_move, PROOF_INFINITY, PROOF_INFINITY)
+        is_proven = self._table[(attacker, defender, is_attacker_to_move)][0] == 0
+
+        if bit is None:
+            return is_proven, None
+        index = bit.bit_length() - 1
+        return is_proven, (index // self._width, index % self._width)
+
+    def _search(self, attacker, defender, is_attacker_to_move, proof_threshold, disproof_threshold):
+        """
+        Expands a node until its proof number or disproof number reaches its threshold
+        :param attacker: integer, bits of the player trying to win
+        :param defender: integer, bits of the other player
+        :param is_attacker_to_move: Boolean, True for OR nodes and False for AND nodes
+        :param proof_threshold: integer
+        :param disproof_threshold: integer
+        :return: the bit of the best child once the thresholds are reached, None if there are no moves
+        """
+        self._nodes += 1
+        if self._nodes > self._node_limit or self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _LimitReached()
+
+        key = (attacker, defender, is_attacker_to_move)
+        children = self._children(attacker, defender, is_attacker_to_move)
+
+        while True:
+            if not children:
+                # Nobody can complete a window any more, so the attacker does not win
+                proof, disproof = PROOF_INFINITY, 0
+            elif is_attacker_to_move:
+                proof = min(child[1] for child in children)
+                disproof = min(PROOF_INFINITY, sum(child[2] for child in children))
+            else:
+                proof = min(PROOF_INFINITY, sum(child[1] for child in children))
+                disproof = min(child[2] for child in children)
+
+            self._table[key] = (proof, disproof)
+
+            # The most proving child is the one with the smallest number the node type minimizes
+            number = 1 if is_attacker_to_move else 2
+            children.sort(key=lambda child: child[number])
+            if proof >= proof_threshold or disproof >= disproof_threshold:
+                return children[0][0] if children else None
+
+            bit = children[0][0]
+            second_best = children[1][number] if len(children) > 1 else PROOF_INFINITY
+
+            if is_attacker_to_move:
+                child_thresholds = (min(proof_threshold, second_best + 1),
+                                    disproof_threshold - disproof + children[0][2])
+                child = (attacker | bit, defender, False)
+            else:
+                child_thresholds = (proof_threshold - proof + children[0][1],
+                                    min(disproof_threshold, second_best + 1))
+                child = (attacker, defender | bit, True)
+
+            self._search(*child, *child_thresholds)
+            children[0] = (bit,) + self._table[child]
+
+    def _children(self, attacker, defender, is_attacker_to_move):
+        """
+        Generates the moves of a node, with the proof and disproof numbers of the positions they lead to
+        :param attacker: integer, bits of the player trying to win
+        :param defender: integer, bits of the other player
+        :param is_attacker_to_move: Boolean
+        :return: list of (move bit, proof number, disproof number) tuples
+        """
+        occupied = attacker | defender
+        relevant = 0
+        for window in self._windows:
+            if not window & attacker or not window & defender:
+                relevant |= window
+        relevant &= ~occupied
+
+        children = []
+        while relevant:
+            bit = relevant & -relevant
+            relevant ^= bit
+
+            if is_attacker_to_move:
+                child = (attacker | bit, defender, False)
+                stones = child[0]
+            else:
+                child = (attacker, defender | bit, True)
+                stones = child[1]
+
+            if any(window & stones == window for window in self._windows_by_cell[bit]):
+                # The move completes five, which ends the game
+                proof, disproof = (0, PROOF_INFINITY) if is_attacker_to_move else (PROOF_INFINITY, 0)
+            else:
+                proof, disproof = self._table.get(child, (1, 1))
+            children.append((bit, proof, disproof))
+
+        return children
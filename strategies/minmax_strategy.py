@@ -1,9 +1,61 @@
-from board import Board
-from constants import col_change, row_change, Player, BOARD_SIZE
+import json
+import os
+import time
+
+from cache import BoundedCache, entries_for_memory
+from constants import col_change, row_change, Player
+from strategies.endgame_solver import EndgameSolver, TABLE_ENTRY_SIZE
 from strategies.strategy import Strategy
 
 INF = int(7e12)
 DEPTH = 4
+# Selective search parameters
+MAX_EXTENSIONS = 1
+LATE_MOVE_INDEX = 3
+LATE_MOVE_REDUCTION = 1
+NULL_MOVE_REDUCTION = 2
+# Number of candidate moves searched, indexed by the remaining depth, the last value being used for larger depths
+CANDIDATES_BY_DEPTH = [5, 5, 7, 10]
+CANDIDATES_AGAINST_FOUR = 4
+
+# Threats a move can create, from the weakest to the strongest
+NO_THREAT, OPEN_THREE_THREAT, FOUR_THREAT = 0, 1, 2
+OPEN_THREE_PATTERNS = [' +++ ', ' ++ + ', ' + ++ ']
+
+# Iterative deepening: the depths from DEPTH_STEP to MAX_DEPTH are searched one after the other, within a node
+# budget, or within the time limit when there is one. The first search is always made, the searches up to DEPTH
+# are made while nodes are left, and a deeper one only when it is expected to finish. A search stopped on the way
+# still gives the best root move it found, since the previous best move is searched first.
+# Every move gets NODE_BUDGET nodes, the average number searched by the plain alpha-beta search at DEPTH, and the
+# nodes a move does not use are saved for the next moves, up to MAX_SAVED_NODES, so that the nodes saved by the
+# selective search are spent on going deeper while the average stays within NODE_BUDGET
+DEPTH_STEP = 2
+MAX_DEPTH = 10
+NODE_BUDGET = 700
+MAX_SAVED_NODES = 8 * NODE_BUDGET
+# Number of candidates of the plain alpha-beta search, at every depth
+PLAIN_CANDIDATES = 10
+# Estimated factor between the nodes, or the time, of a search and those of the search DEPTH_STEP plies shallower,
+# used to decide if a deeper search can finish
+DEPTH_GROWTH = 8
+# Part of the time limit the endgame solver may use, the rest being left for the search if it fails
+SOLVER_TIME_SHARE = 0.5
+
+# Maximum number of bytes used by the caches and tables of one strategy, a quarter being used by the line scores
+# and the rest by the endgame solver table. The rules caches are shared by the process, see rules.set_memory_limit
+MEMORY_LIMIT = 64 * 1024 * 1024
+LINE_SCORE_ENTRY_SIZE = 120
+
+# File with tuned heuristic scores, fitted by tuning.py and copied here once they beat HEURISTIC_SCORES.
+# When it is missing, HEURISTIC_SCORES are used
+WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weights.json')
+
+
+class SearchStopped(Exception):
+    """
+    Raised inside the search when the time limit of the move is over or the node budget is spent
+    """
+    pass
 
 
 # noinspection DuplicatedCode
@@ -29,6 +81,70 @@ class MinmaxStrategy(Strategy):
         " -- ": -50
     }
 
+    def __init__(self, weights_path=WEIGHTS_PATH, memory_limit=MEMORY_LIMIT, verbose=True, node_budget=NODE_BUDGET,
+                 selective=True):
+        """
+        Initializes the strategy and its caches.
+        The caches only depend on the scoring tables, so they are kept between moves and positions
+        :param weights_path: path of a JSON file mapping patterns to scores, which replace HEURISTIC_SCORES
+        :param memory_limit: integer, number of bytes the caches may use, the oldest entries being evicted
+        :param verbose: boolean, if True every computed move is printed
+        :param node_budget: integer, number of nodes a move may search when there is no time limit
+        :param selective: boolean, if False the search is a plain alpha-beta search, without extensions,
+                          reductions or null moves and with PLAIN_CANDIDATES candidates at every depth
+        """
+        self._verbose = verbose
+        self._node_budget = node_budget
+        # Nodes left unused by the previous moves
+        self._saved_nodes = 0
+        self._selective = selective
+        # Best score and variation found so far by the current search at the root, and the move searched first there
+        self._root_best = None
+        self._root_first_move = None
+        # Seconds a move may take, None if there is no limit
+        self._time_limit = None
+        self._deadline = None
+        # Number of nodes after which the current search is stopped, None if it is not limited
+        self._node_limit = None
+        self._depth_reached = 0
+
+        self._heuristic_scores = dict(self.HEURISTIC_SCORES)
+        if weights_path is not None and os.path.exists(weights_path):
+            with open(weights_path) as weights_file:
+                self._heuristic_scores.update(json.load(weights_file))
+
+        # Maps a normalized line ('+', '-' and ' ' characters) to its heuristic score
+        self._line_scores = BoundedCache(1)
+        self._nodes_searched = 0
+        # Used instead of the heuristic search once the position is small enough to be solved exactly
+        self._endgame_solver = EndgameSolver()
+        self.set_memory_limit(memory_limit)
+
+    def set_memory_limit(self, memory_limit):
+        """
+        Sets the number of bytes the caches and tables may use, evicting entries if they already use more
+        :param memory_limit: integer
+        """
+        self._line_scores.resize(entries_for_memory(memory_limit // 4, LINE_SCORE_ENTRY_SIZE))
+        self._endgame_solver.set_table_size(entries_for_memory(memory_limit - memory_limit // 4, TABLE_ENTRY_SIZE))
+
+    def set_time_limit(self, time_limit):
+        """
+        Sets the time a move may take. With a time limit, the searches are deepened while the next one
+        is expected to finish in time, instead of within NODE_BUDGET. The first search, at DEPTH_STEP,
+        is always completed, so a limit of 0 plays as fast as possible
+        :param time_limit: float, number of seconds, or None to limit the number of nodes instead
+        """
+        self._time_limit = time_limit
+
+    @property
+    def depth_reached(self):
+        """
+        Getter, depth of the deepest search completed for the last move
+        :return: integer, 0 if the move was not searched
+        """
+        return self._depth_reached
+
     def make_move(self, board, player_colour) -> tuple:
         """
         Computes and applies a move to the board
@@ -36,22 +152,127 @@ class MinmaxStrategy(Strategy):
         :param player_colour: Player.WHITE or Player.BLACK
         :return: tuple of two integers, coordinates of computed move
         """
-        temporary_board = Board(BOARD_SIZE, board.data[:])
-        initial_possibilities = self.get_possible_cells(board, [], board.get_filled_cells())
-
-        best_score, best_move = self.minmax(temporary_board, DEPTH, True, -INF, INF,
-                                            initial_possibilities, player_colour,
-                                            [])
-        print('Computed move: ' + str(best_move) + ' score: ' + str(best_score))
+        self._nodes_searched = 0
+        self._depth_reached = 0
+        filled_cells = board.get_filled_cells()
+        if not filled_cells:
+            best_move = board.board_size // 2, board.board_size // 2
+            board.set(*best_move, player_colour)
+            return best_move
+
+        start_time = time.perf_counter()
+        deadline = None if self._time_limit is None else start_time + self._time_limit
+
+        if self._endgame_solver.is_applicable(board):
+            solver_deadline = None if deadline is None else start_time + self._time_limit * SOLVER_TIME_SHARE
+            result, solved_move = self._endgame_solver.solve(board, player_colour, solver_deadline)
+            if solved_move is not None:
+                if self._verbose:
+                    print('Solved move: ' + str(solved_move) + ' result: ' + result)
+                board.set(*solved_move, player_colour)
+                return solved_move
+
+        # Everything is computed on a copy, since the game board may be read by another thread during the search
+        temporary_board = board.copy()
+        initial_possibilities = self.get_possible_cells(temporary_board, [], filled_cells)
+        # Kept if no search finishes in time
+        best_score, best_move = None, next(cell for cell in initial_possibilities
+                                           if temporary_board.is_move_allowed(*cell, player_colour))
+
+        node_limit = self._node_budget + min(self._saved_nodes, MAX_SAVED_NODES)
+        for depth in range(DEPTH_STEP, MAX_DEPTH + 1, DEPTH_STEP):
+            iteration_start_time, iteration_start_nodes = time.perf_counter(), self._nodes_searched
+            if depth > DEPTH_STEP:
+                self._deadline = deadline
+                self._node_limit = node_limit if self._time_limit is None else None
+            self._root_best = None
+            try:
+                best_score, best_variation = self.minmax(temporary_board, depth, True, -INF, INF,
+                                                         initial_possibilities, player_colour, [],
+                                                         MAX_EXTENSIONS if self._selective else 0)
+            except SearchStopped:
+                if self._root_best is not None:
+                    best_score, best_variation = self._root_best
+                    best_move = best_variation[0]
+                break
+            best_move = self._root_first_move = best_variation[0]
+            self._depth_reached = depth
+
+            # A forced result does not change with the depth
+            if abs(best_score) >= INF - 1:
+                break
+            if self._time_limit is None:
+                iteration_nodes = self._nodes_searched - iteration_start_nodes
+                if self._nodes_searched >= node_limit or depth >= DEPTH and \
+                        self._nodes_searched + iteration_nodes * DEPTH_GROWTH > node_limit:
+                    break
+            else:
+                iteration_time = time.perf_counter() - iteration_start_time
+                if time.perf_counter() + iteration_time * DEPTH_GROWTH > deadline:
+                    break
+        if self._time_limit is None:
+            self._saved_nodes = max(0, node_limit - self._nodes_searched)
+        self._deadline = self._node_limit = self._root_first_move = None
+
+        if self._verbose:
+            print('Computed move: ' + str(best_move) + ' score: ' + str(best_score) + ' depth: ' +
+                  str(self._depth_reached) + ' nodes: ' + str(self._nodes_searched) + ' time: ' +
+                  '{:.2f}'.format(time.perf_counter() - start_time))
         board.set(*best_move, player_colour)
         return best_move
 
-    def minmax(self, board, depth, is_maximizing, alpha, beta, important_cells, player_colour, moves_so_far):
+    def analyze(self, board, player_colour, depth=DEPTH, number_of_candidates=None):
+        """
+        Scores the candidate moves of a position without modifying the given board.
+        Unlike make_move, every candidate is searched with a full window, so the scores
+        of all the returned candidates are exact and can be compared with each other
+        :param board: Board object, it is left unchanged
+        :param player_colour: Player.WHITE or Player.BLACK, the player at move
+        :param depth: integer, search depth, counting the candidate move itself
+        :param number_of_candidates: optional integer, maximum number of candidates returned
+        :return: list of (move, score, principal variation) tuples, sorted by score, descending.
+                 The principal variation is a list of (row,column) tuples starting with the move
+        """
+        self._nodes_searched = 0
+        if not board.get_filled_cells():
+            # As in make_move, the first move is the center
+            center = board.board_size // 2, board.board_size // 2
+            return [(center, 0, [center])]
+
+        temporary_board = board.copy()
+        important_cells = self.get_possible_cells(temporary_board, [], temporary_board.get_filled_cells())
+        next_player = Player.BLACK if player_colour == Player.WHITE else Player.WHITE
+
+        candidates = []
+        for move in important_cells:
+            row, column = move
+            if not temporary_board.is_move_allowed(row, column, player_colour):
+                continue
+
+            child_board = temporary_board.copy()
+            child_board.set(row, column, player_colour)
+            if child_board.board_winner != Player.NONE or depth <= 1:
+                score = INF - 1 if child_board.board_winner != Player.NONE else \
+                    self.evaluate_board(child_board, player_colour, [move])
+                variation = []
+            else:
+                score, variation = self.minmax(child_board, depth - 1, False, -INF, INF, important_cells,
+                                               next_player, [move])
+
+            candidates.append((move, score, [move] + variation))
+
+        candidates.sort(key=lambda candidate: candidate[1], reverse=True)
+        return candidates[:number_of_candidates]
+
+    def minmax(self, board, depth, is_maximizing, alpha, beta, important_cells, player_colour, moves_so_far,
+               extensions=MAX_EXTENSIONS, threat=NO_THREAT, allow_null_move=True):
         """
         Recursive function that implements the minmax algorithm.
         The end case is at depth 0, when it stops and evaluates the current board.
         For each depth, chooses appropriate "board score", considering if the player is maximizing or not
-        Optimizes the recursion tree by using alpha-beta pruning
+        Optimizes the recursion tree by using alpha-beta pruning.
+        The search is selective: forcing moves are extended, late quiet moves are searched with a reduced depth,
+        a null move is tried to cut quiet positions early and fewer candidates are kept near the leaves
         :param board: Board object
         :param depth: Current depth of the recursion
         :param is_maximizing: Boolean. True if current player is Maximizer and False if current player is Minimizer
@@ -60,69 +281,146 @@ class MinmaxStrategy(Strategy):
         :param important_cells: list of (row,column) integer tuples, represent cells around which pieces might be placed
         :param player_colour:  Player.WHITE or Player.BLACk
         :param moves_so_far: list of (row,column) integer tuples, represent moves made so far in the recursion tree
-        :return: tuple with (best score of the move, (row,column) of the best move)
+        :param extensions: integer, number of plies the search can still be extended by on this path
+        :param threat: NO_THREAT, OPEN_THREE_THREAT or FOUR_THREAT, created by the last move
+        :param allow_null_move: Boolean, False right after a null move, so that two are never made in a row
+        :return: tuple with (best score of the move, principal variation), the principal variation being
+                 the list of (row,column) moves expected from here on, starting with the best move
         """
-        if depth == 0:
-            return self.evaluate_board(board, player_colour, moves_so_far), None
+        self._nodes_searched += 1
+        if self._node_limit is not None and self._nodes_searched > self._node_limit or \
+                self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchStopped()
 
         next_player = Player.BLACK if player_colour == Player.WHITE else Player.WHITE
-        options = self.get_possible_cells(board, important_cells, moves_so_far)
+
+        if depth <= 0:
+            # Reductions and extensions can end the search on either player,
+            # the board is always scored for the maximizer
+            maximizer = player_colour if is_maximizing else next_player
+            return self.evaluate_board(board, maximizer, moves_so_far), []
+
+        # Passing is never better than playing in Gomoku, so if passing is already good enough the node is cut.
+        # It is not safe when the last move was a threat, or at the root, where a move must be returned
+        if self._selective and allow_null_move and threat == NO_THREAT and moves_so_far and \
+                depth > NULL_MOVE_REDUCTION:
+            if is_maximizing:
+                value, _ = self.minmax(board, depth - 1 - NULL_MOVE_REDUCTION, False, beta - 1, beta,
+                                       important_cells, next_player, moves_so_far, extensions, NO_THREAT, False)
+                if value >= beta:
+                    return value, []
+            else:
+                value, _ = self.minmax(board, depth - 1 - NULL_MOVE_REDUCTION, True, alpha, alpha + 1,
+                                       important_cells, next_player, moves_so_far, extensions, NO_THREAT, False)
+                if value <= alpha:
+                    return value, []
+
+        if not self._selective:
+            number_of_candidates = PLAIN_CANDIDATES
+        elif threat == FOUR_THREAT:
+            number_of_candidates = CANDIDATES_AGAINST_FOUR
+        else:
+            number_of_candidates = CANDIDATES_BY_DEPTH[min(depth, len(CANDIDATES_BY_DEPTH) - 1)]
+        options = self.get_possible_cells(board, important_cells, moves_so_far, number_of_candidates)
+        if not moves_so_far and self._root_first_move in options:
+            # The best move of the previous iteration is searched first
+            options.remove(self._root_first_move)
+            options.insert(0, self._root_first_move)
 
         if is_maximizing:
-            best_score, best_move = -INF, None
+            best_score, best_variation = -INF, []
 
-            for move in options:
+            for index, move in enumerate(options):
                 row, column = move
-                if board.get_cell_value(row, column) is not Player.NONE:
+                if not board.is_move_allowed(row, column, player_colour):
                     continue
 
-                temporary_board = Board(BOARD_SIZE, board.data[:])
-
-                temporary_board.set(row, column, player_colour)
-                moves_so_far.append((row, column))
-                if temporary_board.board_winner != Player.NONE:
-                    value = INF - 1
-                else:
-                    value, _ = self.minmax(temporary_board, depth - 1, False, alpha, beta, important_cells,
-                                           next_player, moves_so_far)
-
-                moves_so_far.pop(-1)
+                value, variation = self.search_move(board, move, depth, True, alpha, beta, important_cells,
+                                                    player_colour, moves_so_far, extensions,
+                                                    index >= LATE_MOVE_INDEX and threat == NO_THREAT)
 
                 if value > best_score:
-                    best_score, best_move = value, move
+                    best_score, best_variation = value, [move] + variation
+
+                    # An empty move list means this is the root of the search of make_move
+                    if not moves_so_far:
+                        self._root_best = best_score, best_variation
+                        if self._progress_callback is not None:
+                            self._progress_callback(depth, move, best_score)
 
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
                     break
 
         else:
-            best_score, best_move = INF, None
+            best_score, best_variation = INF, []
 
-            for move in options:
+            for index, move in enumerate(options):
                 row, column = move
-                if board.get_cell_value(row, column) is not Player.NONE:
+                if not board.is_move_allowed(row, column, player_colour):
                     continue
 
-                temporary_board = Board(BOARD_SIZE, board.data[:])
-                temporary_board.set(row, column, player_colour)
-                moves_so_far.append((row, column))
-                if temporary_board.board_winner != Player.NONE:
-                    value = -INF + 1
-                else:
-                    value, _ = self.minmax(temporary_board, depth - 1, True, alpha, beta, important_cells,
-                                           next_player, moves_so_far)
-
-                moves_so_far.pop(-1)
+                value, variation = self.search_move(board, move, depth, False, alpha, beta, important_cells,
+                                                    player_colour, moves_so_far, extensions,
+                                                    index >= LATE_MOVE_INDEX and threat == NO_THREAT)
 
                 if value < best_score:
-                    best_score, best_move = value, move
+                    best_score, best_variation = value, [move] + variation
 
                 beta = min(beta, best_score)
                 if beta <= alpha:
                     break
-        return best_score, best_move
+        return best_score, best_variation
 
-    def get_possible_cells(self, board, important_cells, moves_so_far):
+    def search_move(self, board, move, depth, is_maximizing, alpha, beta, important_cells, player_colour,
+                    moves_so_far, extensions, is_late_move):
+        """
+        Plays a move on a copy of the board and searches the resulting position.
+        A move that makes a four or an open three is searched one ply deeper, while the extensions last.
+        A late quiet move is first searched with a reduced depth, and searched again with the full depth
+        only if it turns out better than the best move so far
+        :param board: Board object, left unchanged
+        :param move: (row,column) tuple, an empty cell
+        :param depth: depth of the node the move is played from
+        :param is_maximizing: Boolean, True if the player making the move is the Maximizer
+        :param alpha: integer value
+        :param beta: integer value
+        :param important_cells: list of (row,column) integer tuples, passed on to minmax
+        :param player_colour: Player.WHITE or Player.BLACK, the player making the move
+        :param moves_so_far: list of (row,column) integer tuples, moves made so far in the recursion tree
+        :param extensions: integer, number of plies the search can still be extended by on this path
+        :param is_late_move: Boolean, True if the move comes late in the ordering of a quiet position
+        :return: tuple with (score of the move, principal variation after the move)
+        """
+        row, column = move
+        next_player = Player.BLACK if player_colour == Player.WHITE else Player.WHITE
+
+        temporary_board = board.copy()
+        temporary_board.set(row, column, player_colour)
+        if temporary_board.board_winner != Player.NONE:
+            return (INF - 1 if is_maximizing else -INF + 1), []
+
+        threat = self.get_threat_level(temporary_board, row, column)
+        child_depth = depth - 1
+        if threat != NO_THREAT and extensions > 0:
+            child_depth, extensions = depth, extensions - 1
+
+        moves_so_far.append(move)
+        if self._selective and is_late_move and threat == NO_THREAT and child_depth > LATE_MOVE_REDUCTION:
+            value, variation = self.minmax(temporary_board, child_depth - LATE_MOVE_REDUCTION, not is_maximizing,
+                                           alpha, beta, important_cells, next_player, moves_so_far, extensions, threat)
+            is_surprise = value > alpha if is_maximizing else value < beta
+            if is_surprise:
+                value, variation = self.minmax(temporary_board, child_depth, not is_maximizing, alpha, beta,
+                                               important_cells, next_player, moves_so_far, extensions, threat)
+        else:
+            value, variation = self.minmax(temporary_board, child_depth, not is_maximizing, alpha, beta,
+                                           important_cells, next_player, moves_so_far, extensions, threat)
+        moves_so_far.pop(-1)
+
+        return value, variation
+
+    def get_possible_cells(self, board, important_cells, moves_so_far, number_of_candidates=10):
         """
         Generates the cells that should be checked further, in a heuristic manner.
         Checking every cell on the board is too computationally expensive, so we have to
@@ -130,6 +428,7 @@ class MinmaxStrategy(Strategy):
         :param moves_so_far: list of (row,column), representing cells already placed in the recursion tree
         :param board: Board object
         :param important_cells: list of (row,column), places on the board that have pieces
+        :param number_of_candidates: integer, maximum number of moves returned
         :return: list of moves, as tuples of two integers, sorted by score, descending
         """
         cells = set(important_cells)
@@ -145,7 +444,8 @@ class MinmaxStrategy(Strategy):
 
         cells = list(cells) + moves_so_far
 
-        return sorted(cells, key=lambda cell: self.get_cell_importance(board, *cell), reverse=True)[:10]
+        cells.sort(key=lambda cell: self.get_cell_importance(board, *cell), reverse=True)
+        return cells[:number_of_candidates]
 
     def evaluate_board(self, board, player, moves_so_far):
         """
@@ -164,17 +464,70 @@ class MinmaxStrategy(Strategy):
                 line = board.get_line_of_characters(row, column, direction)
                 line = line.replace(maximizer, '+').replace(minimizer, '-')
 
-                values = {}
-                substrings = [line[i:i + length] for length in [4, 5, 6] for i in range(len(line)) if
-                              i + length < len(line)]
-                for substring in substrings:
-                    values[substring] = values[substring] + 1 if substring in values else 1
+                if line not in self._line_scores:
+                    self._line_scores[line] = self.evaluate_line(line)
+                score += self._line_scores[line]
+
+        return score
+
+    def evaluate_line(self, line):
+        """
+        Heuristic function to evaluate a single line, by counting the scored patterns it contains
+        :param line: string with characters ' ', '+' and '-'
+        :return: The score of the line
+        """
+        score = 0
+        values = {}
+        substrings = [line[i:i + length] for length in [4, 5, 6] for i in range(len(line)) if
+                      i + length < len(line)]
+        for substring in substrings:
+            values[substring] = values[substring] + 1 if substring in values else 1
 
-                for item in self.HEURISTIC_SCORES.keys():
-                    score += self.HEURISTIC_SCORES[item] * values[item] if item in values else 0
+        for item in self._heuristic_scores.keys():
+            score += self._heuristic_scores[item] * values[item] if item in values else 0
 
         return score
 
+    @staticmethod
+    def get_threat_level(board, row, column):
+        """
+        Finds the strongest threat made by the piece at row and column, looking at the cells
+        at most 4 cells away from it, on each of the 4 lines through it
+        :param board: Board object
+        :param row: integer in range [0, board size - 1]
+        :param column: integer in range [0, board size - 1]
+        :return: FOUR_THREAT if the piece makes four in a five cell window with one empty cell,
+                 OPEN_THREE_THREAT if it makes an open three, NO_THREAT otherwise
+        """
+        player = board.get_cell_value(row, column)
+        threat = NO_THREAT
+
+        for direction in range(4):
+            line = ''
+            for distance in range(-4, 5):
+                new_row = row + distance * row_change[direction]
+                new_column = column + distance * col_change[direction]
+
+                if not board.are_coordinates_valid(new_row, new_column):
+                    line += '-'
+                elif board.get_cell_value(new_row, new_column) == player:
+                    line += '+'
+                elif board.get_cell_value(new_row, new_column) == Player.NONE:
+                    line += ' '
+                else:
+                    line += '-'
+
+            # Every window of the 9 cells line contains the piece in the middle
+            for start in range(5):
+                window = line[start:start + 5]
+                if window.count('+') == 4 and window.count(' ') == 1:
+                    return FOUR_THREAT
+
+            if any(pattern in line for pattern in OPEN_THREE_PATTERNS):
+                threat = OPEN_THREE_THREAT
+
+        return threat
+
     @staticmethod
     def get_cell_importance(board, row, column):
         """
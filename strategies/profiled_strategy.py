@@ -0,0 +1,119 @@
+import sys
+import tracemalloc
+
+from strategies.strategy import Strategy
+
+# Number of source lines listed in every report, those whose allocations grew the most
+TOP_ALLOCATIONS = 5
+# Leaves out the memory used by tracemalloc itself
+TRACEMALLOC_FILTER = tracemalloc.Filter(False, tracemalloc.__file__)
+
+
+class MemoryReport:
+    """
+    Memory used while computing one move
+    """
+    def __init__(self, move, nodes, peak_allocated_bytes, retained_bytes, peak_rss_growth, top_allocations):
+        self.move = move
+        self.nodes = nodes
+        # Growth of the traced memory at its highest point during the move, not the total allocated
+        self.peak_allocated_bytes = peak_allocated_bytes
+        self.retained_bytes = retained_bytes
+        # Bytes the peak resident set size of the process grew by during the move, 0 if it stayed below
+        # an earlier peak, or None if it is not known
+        self.peak_rss_growth = peak_rss_growth
+        self.top_allocations = top_allocations
+
+    @property
+    def peak_bytes_per_node(self):
+        """
+        Getter, peak memory allocated during the move divided by the number of positions searched,
+        which shows how the peak grows with the search, not how much every node allocates
+        :return: float or None if the strategy does not count its nodes
+        """
+        if not self.nodes:
+            return None
+        return self.peak_allocated_bytes / self.nodes
+
+    def __str__(self):
+        lines = ['Move ' + str(self.move) + ': ' + str(self.nodes) + ' nodes, ' +
+                 str(self.peak_allocated_bytes) + ' bytes peak, ' + str(self.retained_bytes) + ' bytes retained, ' +
+                 'peak RSS grew by ' + str(self.peak_rss_growth) + ' bytes']
+        if self.peak_bytes_per_node is not None:
+            lines.append('  ' + '{:.0f}'.format(self.peak_bytes_per_node) + ' peak bytes per node')
+        lines += ['  ' + str(statistic) for statistic in self.top_allocations]
+        return '\n'.join(lines)
+
+
+class ProfiledStrategy(Strategy):
+    """
+    Strategy that computes its moves with another strategy and accounts for the memory used by every move.
+    Tracemalloc snapshots taken before and after each move are compared to find where memory was kept
+    """
+    def __init__(self, strategy, verbose=True):
+        """
+        Initializes the strategy and starts tracing memory allocations
+        :param strategy: class that implements Strategy abstract class, used to compute the moves
+        :param verbose: boolean, if True every report is printed
+        """
+        self._strategy = strategy
+        self._verbose = verbose
+        self._reports = []
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def reports(self):
+        return self._reports
+
+    @property
+    def nodes_searched(self):
+        return self._strategy.nodes_searched
+
+    def set_progress_callback(self, callback):
+        self._strategy.set_progress_callback(callback)
+
+    def make_move(self, board, player_colour):
+        """
+        Computes and applies a move with the profiled strategy, then records its memory report
+        :param board: Board object
+        :param player_colour: Player.WHITE or Player.BLACK
+        :return: tuple of two integers, coordinates of computed move
+        """
+        snapshot_before = tracemalloc.take_snapshot()
+        peak_rss_before = peak_rss()
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+
+        move = self._strategy.make_move(board, player_colour)
+
+        memory_after, memory_peak = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot().filter_traces([TRACEMALLOC_FILTER])
+        statistics = snapshot_after.compare_to(snapshot_before.filter_traces([TRACEMALLOC_FILTER]), 'lineno')
+
+        peak_rss_after = peak_rss()
+        peak_rss_growth = None if peak_rss_after is None else peak_rss_after - peak_rss_before
+
+        report = MemoryReport(move, self._strategy.nodes_searched, memory_peak - memory_before,
+                              memory_after - memory_before, peak_rss_growth, statistics[:TOP_ALLOCATIONS])
+        self._reports.append(report)
+        if self._verbose:
+            print(report)
+        return move
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of the process since it started. The operating system only keeps
+    this high-water mark, so the peak of a single move is only seen when it grows past the earlier ones
+    :return: integer, in bytes, or None on platforms without the resource module
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # macOS reports bytes, the other systems KiB
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
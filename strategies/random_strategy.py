@@ -12,6 +12,7 @@ class RandomStrategy(Strategy):
         """
         Computes a valid move around last placed piece randomly.
         If it is not possible, places at any valid cell.
+        Cells forbidden by the rules of the board are not valid
         :param board: Board object
         :param player_colour: Player.WHITE or Player.BLACK
         :return: tuple of two integers
@@ -23,13 +24,13 @@ class RandomStrategy(Strategy):
             move_column = last_column + constants.col_change[direction]
 
             if board.are_coordinates_valid(move_line, move_column) \
-                    and board.is_cell_empty(move_line, move_column):
+                    and board.is_move_allowed(move_line, move_column, player_colour):
                 board.set(move_line, move_column, player_colour)
                 return move_line, move_column
 
         for line in range(board.board_size):
             for column in range(board.board_size):
-                if board.is_cell_empty(line, column):
+                if board.is_move_allowed(line, column, player_colour):
                     board.set(line, column, player_colour)
                     return line, column
 
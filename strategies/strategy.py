@@ -5,6 +5,23 @@ class Strategy(ABC):
     """
     Abstract class that should be implemented by strategies
     """
+    # Function called by the strategies that report the progress of their search
+    _progress_callback = None
+    # Number of positions searched for the last move, kept by the strategies that search
+    _nodes_searched = None
+
+    @property
+    def nodes_searched(self):
+        return self._nodes_searched
+
+    def set_progress_callback(self, callback):
+        """
+        Sets the function called while a move is computed, to report the search progress.
+        It may be called from the thread that computes the move
+        :param callback: function taking (depth, best move so far, score) or None
+        """
+        self._progress_callback = callback
+
     @abstractmethod
     def make_move(self, board, player_colour) -> object:
         """
@@ -0,0 +1,62 @@
+import itertools
+import time
+import unittest
+
+from analysis import BatchAnalyzer
+from board import Board
+from constants import Player
+from strategies.minmax_strategy import MinmaxStrategy
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = Board(11)
+        self.board.set(1, 1, Player.WHITE)
+        self.board.set(1, 2, Player.WHITE)
+        self.board.set(1, 3, Player.WHITE)
+        self.board.set(1, 5, Player.WHITE)
+
+    def test_analyze(self):
+        strategy = MinmaxStrategy()
+        filled_cells = self.board.get_filled_cells()
+
+        candidates = strategy.analyze(self.board, Player.WHITE, number_of_candidates=3)
+        self.assertEqual(len(candidates), 3)
+        move, score, variation = candidates[0]
+        self.assertEqual(move, (1, 4))
+        self.assertEqual(variation[0], move)
+        self.assertGreaterEqual(score, candidates[1][1])
+        self.assertEqual(self.board.get_filled_cells(), filled_cells)
+
+        self.assertEqual(strategy.analyze(Board(11), Player.BLACK), [((5, 5), 0, [(5, 5)])])
+
+    def test_batch(self):
+        analyzer = BatchAnalyzer(workers=2, depth=2, number_of_candidates=1)
+        results = list(analyzer.analyze([(self.board, Player.WHITE), (self.board, Player.BLACK)]))
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][0][0], (1, 4))
+        self.assertEqual(results[1][0][0], (1, 4))
+        self.assertEqual(analyzer.positions_analyzed, 2)
+        self.assertGreater(analyzer.positions_per_second, 0)
+
+    def test_batch_streaming(self):
+        read_positions = []
+
+        def endless_positions():
+            while True:
+                read_positions.append(len(read_positions))
+                yield self.board, Player.WHITE
+
+        analyzer = BatchAnalyzer(workers=2, depth=2, number_of_candidates=1, chunk_size=2)
+        results = []
+        for result in itertools.islice(analyzer.analyze(endless_positions()), 3):
+            results.append(result)
+            # Time spent by the caller does not count against the throughput
+            time.sleep(0.5)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[2][0][0], (1, 4))
+        # The four positions in flight and one more for each result
+        self.assertLessEqual(len(read_positions), 7)
+        self.assertGreater(analyzer.positions_per_second, 3)
@@ -1,7 +1,9 @@
+import pickle
 import unittest
 
 from board import Board
 from constants import Player
+from rules import RULES
 
 
 class MyTestCase(unittest.TestCase):
@@ -25,3 +27,29 @@ class MyTestCase(unittest.TestCase):
         board.set(1, 7, Player.BLACK)
         self.assertEqual(board.board_winner, Player.BLACK)
         self.assertEqual(board.are_coordinates_valid(11, 20), False)
+
+    def test_line_bits(self):
+        board = Board(11)
+        board.set(5, 4, Player.BLACK)
+        # The cells 6 to the west and to the east are outside the board, so they are white bits
+        self.assertEqual(board.get_line_bits(5, 5, 2), (0b0000000100000, 0b1000000000001))
+
+        board.set(5, 7, Player.WHITE)
+        copy = board.copy()
+        board.set_without_checking(5, 4, Player.NONE)
+        self.assertEqual(board.get_line_bits(5, 5, 2), (0, 0b1000100000001))
+        self.assertEqual(copy.get_line_bits(5, 5, 2), (0b0000000100000, 0b1000100000001))
+        # North is direction 0, so the bits go up the column
+        self.assertEqual(copy.get_line_bits(5, 4, 0), (0b0000001000000, 0b1000000000001))
+
+    def test_pickle(self):
+        board = Board(11, rules=RULES['renju'])
+        board.set(5, 5, Player.BLACK)
+        RULES['renju'].is_forbidden(board, 5, 6, Player.BLACK)
+
+        data = pickle.dumps(board)
+        self.assertNotIn(b'_line_shapes', data)
+        copy = pickle.loads(data)
+        self.assertIs(copy.rules, RULES['renju'])
+        self.assertEqual(copy.get_cell_value(5, 5), Player.BLACK)
+        self.assertEqual(copy.get_line_bits(5, 6, 2), board.get_line_bits(5, 6, 2))
@@ -0,0 +1,28 @@
+import unittest
+
+from cache import BoundedCache, entries_for_memory
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        pass
+
+    def test_cache(self):
+        cache = BoundedCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache['a'] = 3
+        self.assertEqual(len(cache), 2)
+
+        cache['c'] = 4
+        self.assertEqual(len(cache), 2)
+        self.assertFalse('a' in cache)
+        self.assertEqual(cache['b'], 2)
+        self.assertEqual(cache.get('a', 0), 0)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_entries_for_memory(self):
+        self.assertEqual(entries_for_memory(1000, 100), 10)
+        self.assertEqual(entries_for_memory(10, 100), 1)
@@ -0,0 +1,65 @@
+import unittest
+
+from board import Board
+from constants import Player
+from strategies.endgame_solver import EndgameSolver, WIN, LOSS, DRAW, UNKNOWN
+from strategies.minmax_strategy import MinmaxStrategy
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # A full board where every line alternates pairs of pieces, so nobody has five
+        self.board = Board(11)
+        for row in range(11):
+            for column in range(11):
+                colour = Player.BLACK if (column + 2 * row) % 4 < 2 else Player.WHITE
+                self.board.set_without_checking(row, column, colour)
+
+    def make_four(self, cells, empty_cell):
+        for cell in cells:
+            self.board.set_without_checking(*cell, Player.BLACK)
+        self.board.set_without_checking(*empty_cell, Player.NONE)
+
+    def test_draw(self):
+        for cell in [(0, 0), (5, 5), (10, 10)]:
+            self.board.set_without_checking(*cell, Player.NONE)
+
+        solver = EndgameSolver()
+        self.assertTrue(solver.is_applicable(self.board))
+        result, move = solver.solve(self.board, Player.BLACK)
+        self.assertEqual(result, DRAW)
+        self.assertIn(move, [(0, 0), (5, 5), (10, 10)])
+
+    def test_win_and_loss(self):
+        self.make_four([(5, 0), (5, 1), (5, 2), (5, 3)], (5, 4))
+        solver = EndgameSolver()
+
+        self.assertEqual(solver.solve(self.board, Player.BLACK), (WIN, (5, 4)))
+        self.assertEqual(solver.solve(self.board, Player.WHITE), (DRAW, (5, 4)))
+
+        self.make_four([(0, 10), (1, 10), (2, 10), (3, 10)], (4, 10))
+        self.assertEqual(solver.solve(self.board, Player.WHITE), (LOSS, None))
+
+    def test_limits(self):
+        self.make_four([(5, 0), (5, 1), (5, 2), (5, 3)], (5, 4))
+        for cell in [(0, 0), (10, 10)]:
+            self.board.set_without_checking(*cell, Player.NONE)
+
+        solver = EndgameSolver(node_limit=1)
+        self.assertEqual(solver.solve(self.board, Player.WHITE), (UNKNOWN, None))
+
+        solver = EndgameSolver(time_limit=0)
+        self.assertEqual(solver.solve(self.board, Player.WHITE), (UNKNOWN, None))
+        solver = EndgameSolver()
+        self.assertEqual(solver.solve(self.board, Player.WHITE, deadline=0), (UNKNOWN, None))
+
+        solver = EndgameSolver(table_size=1)
+        self.assertEqual(solver.solve(self.board, Player.WHITE), (DRAW, (5, 4)))
+        self.assertLessEqual(solver.table_size, 1)
+
+    def test_minmax_uses_solver(self):
+        self.make_four([(5, 0), (5, 1), (5, 2), (5, 3)], (5, 4))
+
+        move = MinmaxStrategy().make_move(self.board, Player.BLACK)
+        self.assertEqual(move, (5, 4))
+        self.assertEqual(self.board.board_winner, Player.BLACK)
@@ -0,0 +1,48 @@
+import tracemalloc
+import unittest
+
+from board import Board
+from constants import Player
+from rules import RULES, LINE_SHAPES_SIZE, LINE_SHAPE_ENTRY_SIZE, set_memory_limit
+from strategies.minmax_strategy import MinmaxStrategy
+from strategies.profiled_strategy import ProfiledStrategy
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = Board(11)
+        self.board.set(5, 5, Player.BLACK)
+        self.board.set(5, 6, Player.WHITE)
+        self.board.set(6, 5, Player.BLACK)
+
+    def tearDown(self) -> None:
+        tracemalloc.stop()
+
+    def test_report(self):
+        strategy = ProfiledStrategy(MinmaxStrategy(), verbose=False)
+
+        move = strategy.make_move(self.board, Player.WHITE)
+        self.assertEqual(self.board.last_move, move)
+
+        report = strategy.reports[0]
+        self.assertEqual(report.move, move)
+        self.assertGreater(report.nodes, 0)
+        self.assertGreater(report.peak_allocated_bytes, 0)
+        self.assertGreater(report.peak_bytes_per_node, 0)
+        self.assertGreaterEqual(report.peak_rss_growth, 0)
+        self.assertIn('nodes', str(report))
+
+    def test_memory_limit(self):
+        strategy = MinmaxStrategy(memory_limit=4000)
+        strategy.make_move(self.board, Player.WHITE)
+
+        self.assertLessEqual(len(strategy._line_scores), 4000 // 4 // 120)
+
+        # The rules caches are shared by the process, so a strategy does not resize them
+        renju_rules = RULES['renju']
+        self.assertEqual(renju_rules._line_shapes.max_entries, LINE_SHAPES_SIZE)
+        set_memory_limit(240 * 3)
+        for column in range(8):
+            renju_rules.is_forbidden(self.board, 0, column, Player.BLACK)
+        self.assertLessEqual(len(renju_rules._line_shapes), 3)
+        set_memory_limit(LINE_SHAPES_SIZE * LINE_SHAPE_ENTRY_SIZE)
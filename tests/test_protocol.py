@@ -0,0 +1,62 @@
+import io
+import unittest
+
+from constants import Player
+from ui.protocol import Protocol
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.output = io.StringIO()
+
+    def run_commands(self, commands):
+        protocol = Protocol(input_stream=io.StringIO('\n'.join(commands) + '\n'), output_stream=self.output)
+        protocol.run()
+        return protocol, self.output.getvalue().splitlines()
+
+    def test_begin_and_turn(self):
+        protocol, answers = self.run_commands(['START 15', 'BEGIN', 'TURN 0,0', 'END', 'ABOUT'])
+
+        self.assertEqual(answers[0], 'OK')
+        self.assertEqual(answers[1], '7,7')
+        self.assertEqual(len(answers), 3)
+        self.assertEqual(protocol.colour, Player.BLACK)
+        self.assertEqual(protocol.game.board.board_size, 15)
+        self.assertEqual(protocol.game.board.get_cell_value(0, 0), Player.WHITE)
+        self.assertEqual(len(protocol.game.board.get_filled_cells()), 3)
+
+    def test_board(self):
+        # Four white pieces in a row, the engine plays White and completes the five
+        protocol, answers = self.run_commands(['START 11', 'BOARD', '1,5,1', '2,5,1', '3,5,1', '4,5,1',
+                                               '1,1,2', '3,2,2', '8,8,2', '9,1,2', '1,9,2', 'DONE'])
+
+        self.assertEqual(protocol.colour, Player.WHITE)
+        self.assertIn(answers[1], ['0,5', '5,5'])
+        self.assertEqual(protocol.game.board.board_winner, Player.WHITE)
+
+    def test_invalid_board(self):
+        protocol, answers = self.run_commands(['START', 'BOARD', '1,5,1', 'x,5,1', '8,8,2', 'DONE', 'ABOUT'])
+
+        self.assertEqual(answers[1:], ['ERROR invalid literal for int() with base 10: \'x\'',
+                                       'name="gomokai", version="1.0"'])
+
+    def test_repeated_board_cell(self):
+        protocol, answers = self.run_commands(['START', 'BOARD', '1,5,1', '1,5,2', 'DONE'])
+
+        self.assertEqual(answers[1:], ['ERROR Cell not empty!'])
+
+    def test_fastest_moves(self):
+        protocol, answers = self.run_commands(['START', 'INFO timeout_turn 0', 'BEGIN', 'TURN 0,0'])
+
+        self.assertEqual(protocol.time_limit, 0)
+        self.assertEqual(len(answers), 3)
+        self.assertEqual(protocol.game.board.get_cell_value(0, 0), Player.WHITE)
+
+    def test_errors(self):
+        protocol, answers = self.run_commands(['START 3', 'START', 'TURN 11,0', 'TURN 1', 'INFO timeout_turn 200',
+                                               'INFO max_memory 0', 'INFO rule 4', 'SWAP2BOARD'])
+
+        self.assertEqual(answers, ['ERROR Unsupported board size!', 'OK', 'ERROR Column value out of range!',
+                                   'ERROR Invalid coordinates!', 'UNKNOWN SWAP2BOARD'])
+        self.assertAlmostEqual(protocol.time_limit, 0.16)
+        self.assertEqual(protocol.game.board.rules.name, 'renju')
@@ -0,0 +1,132 @@
+import unittest
+
+from board import Board
+from constants import Player
+from game import Game
+from rules import RULES
+from strategies.minmax_strategy import MinmaxStrategy
+from strategies.random_strategy import RandomStrategy
+
+# Known positions for Black under Renju rules: rows of 'B', 'W' and '.', the move being played at '*'
+FORBIDDEN_POINTS = [
+    ('double three', True, [
+        '.....',
+        '..B..',
+        '..B..',
+        'BB*..',
+        '.....',
+    ]),
+    ('three blocked on one side', False, [
+        '.....',
+        '..B..',
+        '..B..',
+        'BB*..',
+        '..W..',
+    ]),
+    ('split double three', True, [
+        '......',
+        '...B..',
+        '......',
+        '...B..',
+        'B.B*..',
+        '......',
+    ]),
+    ('double four', True, [
+        '...B...',
+        '...B...',
+        '...B...',
+        'BBB*...',
+        '.......',
+    ]),
+    ('double four on one line', True, [
+        '.B.BB*.B.',
+    ]),
+    ('four three', False, [
+        '.....W.',
+        '.....B.',
+        '.....B.',
+        'WBBB.*.',
+        '.......',
+    ]),
+    ('overline', True, [
+        '.BBB*BB.',
+    ]),
+    ('five next to a double three', False, [
+        '.........',
+        '.....B...',
+        '.....B...',
+        '.BBBB*...',
+        '.....B...',
+        '.......B.',
+        '........B',
+    ]),
+    ('straight four', False, [
+        '..BBB*...',
+    ]),
+]
+
+
+def make_board(diagram, rules):
+    """
+    Builds a board from a diagram, placed with its top left corner at (2, 2)
+    :return: tuple (Board object, (row,column) of the '*' cell)
+    """
+    board = Board(11, rules=rules)
+    point = None
+    for row, line in enumerate(diagram, start=2):
+        for column, character in enumerate(line, start=2):
+            if character == 'B':
+                board.set_without_checking(row, column, Player.BLACK)
+            elif character == 'W':
+                board.set_without_checking(row, column, Player.WHITE)
+            elif character == '*':
+                point = (row, column)
+    return board, point
+
+
+class MyTestCase(unittest.TestCase):
+    def test_forbidden_points(self):
+        for name, is_forbidden, diagram in FORBIDDEN_POINTS:
+            board, point = make_board(diagram, RULES['renju'])
+            self.assertEqual(board.rules.is_forbidden(board, *point, Player.BLACK), is_forbidden, name)
+            self.assertFalse(board.rules.is_forbidden(board, *point, Player.WHITE), name)
+
+            for rules in ['freestyle', 'standard']:
+                board, point = make_board(diagram, RULES[rules])
+                self.assertFalse(board.rules.is_forbidden(board, *point, Player.BLACK), name)
+
+    def test_overline(self):
+        for rules, black_wins, white_wins in [('freestyle', True, True), ('standard', False, False),
+                                              ('renju', False, True)]:
+            for player, wins in [(Player.BLACK, black_wins), (Player.WHITE, white_wins)]:
+                board = Board(11, rules=RULES[rules])
+                for column in [0, 1, 2, 4, 5]:
+                    board.set(3, column, player)
+                board.set(3, 3, player)
+                self.assertEqual(board.board_winner == player, wins, rules)
+
+    def test_exactly_five(self):
+        for rules in RULES.values():
+            board = Board(11, rules=rules)
+            for column in range(5):
+                board.set(3, column, Player.BLACK)
+            self.assertEqual(board.board_winner, Player.BLACK)
+
+    def test_game_and_strategies(self):
+        game = Game(RandomStrategy(), RULES['renju'])
+        for row, column in [(3, 5), (4, 5), (5, 3), (5, 4)]:
+            game.human_move(row, column, Player.BLACK)
+        self.assertRaises(ValueError, game.human_move, 5, 5, Player.BLACK)
+
+        game.restart()
+        self.assertEqual(game.board.rules, RULES['renju'])
+
+        # Black would win with (3, 3) under freestyle rules, but it makes an overline
+        board = Board(11, rules=RULES['renju'])
+        for column in [0, 1, 2, 4, 5, 7]:
+            board.set(3, column, Player.BLACK)
+        board.set(4, 4, Player.WHITE)
+        board.set(2, 2, Player.WHITE)
+        move = MinmaxStrategy().make_move(board, Player.BLACK)
+        self.assertNotEqual(move, (3, 3))
+        self.assertEqual(board.board_winner, Player.NONE)
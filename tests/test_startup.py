@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import unittest
+
+# Modules a headless engine worker needs
+ENGINE_MODULES = ['board', 'game', 'strategies.minmax_strategy', 'strategies.random_strategy', 'analysis']
+# Maximum time, in microseconds, for importing the engine modules in a new worker process
+STARTUP_BUDGET_US = 100000
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + ', '.join(ENGINE_MODULES)],
+                                 capture_output=True, text=True, check=True)
+
+        # Every line is "import time: self [us] | cumulative | module", cumulative including the nested imports
+        self.imports = {}
+        for line in process.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, module = line[len('import time:'):].split('|')
+            self.imports[module.strip()] = int(cumulative)
+
+    def test_no_ui_dependencies(self):
+        for module in self.imports:
+            self.assertFalse(module.split('.')[0] in ('pygame', 'texttable', 'ui'), module)
+
+    def test_startup_budget(self):
+        total_time = sum(self.imports[module] for module in ENGINE_MODULES)
+        self.assertLess(total_time, STARTUP_BUDGET_US)
@@ -1,8 +1,9 @@
+import random
 import unittest
 
 from board import Board
 from constants import Player
-from strategies.minmax_strategy import MinmaxStrategy
+from strategies.minmax_strategy import MinmaxStrategy, NODE_BUDGET, NO_THREAT, OPEN_THREE_THREAT, FOUR_THREAT
 from strategies.random_strategy import RandomStrategy
 
 
@@ -30,3 +31,57 @@ class MyTestCase(unittest.TestCase):
         self.board.set_without_checking(1, 4, Player.NONE)
         last_move = strategy.make_move(self.board, Player.WHITE)
         self.assertEqual((1, 4), last_move)
+
+    def test_iterative_deepening(self):
+        # At the same node budget, the selective search completes deeper searches than the plain alpha-beta search
+        depths = {True: 0, False: 0}
+        for seed in range(12):
+            for selective in depths:
+                strategy = MinmaxStrategy(verbose=False, selective=selective)
+                board = Board(11)
+                cells = random.Random(seed).sample([(row, column) for row in range(3, 8) for column in range(3, 8)], 6)
+                for index, cell in enumerate(cells):
+                    board.set(*cell, Player.BLACK if index % 2 == 0 else Player.WHITE)
+
+                strategy.make_move(board, Player.BLACK)
+                depths[selective] += strategy.depth_reached
+                self.assertLessEqual(strategy.nodes_searched, NODE_BUDGET + 1)
+
+        self.assertGreater(depths[True], depths[False])
+
+    def test_threat_level(self):
+        for column in range(1, 4):
+            self.board.set(5, column, Player.WHITE)
+        self.assertEqual(MinmaxStrategy.get_threat_level(self.board, 5, 3), OPEN_THREE_THREAT)
+
+        self.board.set(5, 0, Player.BLACK)
+        self.assertEqual(MinmaxStrategy.get_threat_level(self.board, 5, 3), NO_THREAT)
+
+        self.board.set(5, 5, Player.WHITE)
+        self.assertEqual(MinmaxStrategy.get_threat_level(self.board, 5, 5), FOUR_THREAT)
+
+    def play_until_finished(self, player_colour, number_of_moves):
+        strategy = MinmaxStrategy()
+        for _ in range(number_of_moves):
+            strategy.make_move(self.board, player_colour)
+            if self.board.board_winner != Player.NONE:
+                break
+            player_colour = Player.BLACK if player_colour == Player.WHITE else Player.WHITE
+
+    def test_minmax_open_three_wins(self):
+        for cell in [(5, 3), (5, 4), (5, 5)]:
+            self.board.set(*cell, Player.WHITE)
+        for cell in [(0, 0), (0, 10), (10, 0)]:
+            self.board.set(*cell, Player.BLACK)
+
+        self.play_until_finished(Player.WHITE, 5)
+        self.assertEqual(self.board.board_winner, Player.WHITE)
+
+    def test_minmax_double_four_wins(self):
+        for cell in [(5, 3), (5, 4), (5, 5), (2, 6), (3, 6), (4, 6)]:
+            self.board.set(*cell, Player.WHITE)
+        for cell in [(5, 2), (1, 6), (9, 9), (9, 1), (8, 8)]:
+            self.board.set(*cell, Player.BLACK)
+
+        self.play_until_finished(Player.WHITE, 5)
+        self.assertEqual(self.board.board_winner, Player.WHITE)
@@ -0,0 +1,91 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from board import Board
+from constants import Player
+from strategies.minmax_strategy import MinmaxStrategy
+from strategies.random_strategy import RandomStrategy
+from tuning import TUNED_PATTERNS, encode_positions, export_weights, extract_features, fit_weights, play_games, \
+    play_match, read_game_records, OWN, OTHER, NO_ANCHOR
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # Black builds a row on line 5 while White answers on line 0, so Black wins
+        black_moves = [(5, column) for column in range(5)]
+        white_moves = [(0, column) for column in range(0, 8, 2)]
+        moves = [move for pair in zip(black_moves, white_moves) for move in pair] + [black_moves[-1]]
+        self.games = [(Player.BLACK, moves)]
+
+    def test_encode_positions(self):
+        boards, anchors, results = encode_positions(self.games, skipped_moves=1)
+
+        self.assertEqual(boards.shape, (8, 11, 11))
+        self.assertEqual(anchors[0].tolist(), [[NO_ANCHOR, NO_ANCHOR]] * 3 + [[5, 0]])
+        self.assertEqual(anchors[-1].tolist(), [[5, 2], [0, 4], [5, 3], [0, 6]])
+        # After Black's first move, White is at move and sees Black's piece as the other player's
+        self.assertEqual(boards[0][5][0], OTHER)
+        self.assertEqual(results[0], 0.0)
+        self.assertEqual(boards[1][5][0], OWN)
+        self.assertEqual(results[1], 1.0)
+
+    def test_extract_features(self):
+        board = np.zeros((1, 11, 11), dtype=np.int8)
+        board[0, 5, 3:6] = OWN
+
+        # The horizontal line through the anchor is counted once, and once more for the second anchor
+        features = extract_features(board, np.array([[[5, 4], [NO_ANCHOR, NO_ANCHOR]]]))
+        self.assertEqual(features[0][TUNED_PATTERNS.index(' +++ ')], 1)
+        self.assertEqual(features[0][TUNED_PATTERNS.index(' --- ')], 0)
+        features = extract_features(board, np.array([[[5, 4], [5, 9]]]))
+        self.assertEqual(features[0][TUNED_PATTERNS.index(' +++ ')], 2)
+
+    def test_features_match_evaluation(self):
+        # The features weighted by the scores give the evaluation of the search, from the player at move
+        strategy = MinmaxStrategy()
+        patterns = list(strategy.HEURISTIC_SCORES)
+        scores = np.array([strategy.HEURISTIC_SCORES[pattern] for pattern in patterns])
+        random.seed(3)
+
+        for _ in range(20):
+            moves = random.sample([(row, column) for row in range(11) for column in range(11)], 30)
+            boards, anchors, _ = encode_positions([(Player.NONE, moves)], skipped_moves=1)
+            features = extract_features(boards, anchors, patterns)
+
+            for index in range(len(boards)):
+                board = Board(11)
+                for move_index, move in enumerate(moves[:index + 1]):
+                    board.set_without_checking(*move, Player.BLACK if move_index % 2 == 0 else Player.WHITE)
+                player_at_move = Player.WHITE if index % 2 == 0 else Player.BLACK
+                anchor_moves = [tuple(anchor) for anchor in anchors[index] if anchor[0] != NO_ANCHOR]
+
+                self.assertEqual(int(features[index] @ scores),
+                                 strategy.evaluate_board(board, player_at_move, anchor_moves))
+
+    def test_play_games(self):
+        path = os.path.join(tempfile.mkdtemp(), 'records.txt')
+        play_games(path, 2, RandomStrategy(), seed=1)
+
+        games = read_game_records(path)
+        self.assertEqual(len(games), 2)
+        for winner, moves in games:
+            self.assertGreaterEqual(len(moves), 9)
+            self.assertEqual(len(set(moves)), len(moves))
+
+    def test_play_match(self):
+        wins, losses, draws = play_match(RandomStrategy(), RandomStrategy(), 2, seed=1)
+        self.assertEqual(wins + losses + draws, 4)
+
+    def test_fit_and_export(self):
+        boards, anchors, results = encode_positions(self.games, skipped_moves=1)
+        weights = fit_weights(extract_features(boards, anchors), results, iterations=200)
+        self.assertEqual(weights.shape, (len(TUNED_PATTERNS),))
+
+        path = os.path.join(tempfile.mkdtemp(), 'weights.json')
+        export_weights(weights, path)
+        strategy = MinmaxStrategy(path)
+        self.assertEqual(strategy.evaluate_line('  +++   '), round(weights[TUNED_PATTERNS.index(' +++ ')] * 1000))
@@ -0,0 +1,340 @@
+import argparse
+import json
+import os
+import random
+
+import numpy as np
+
+from constants import BOARD_SIZE, Player, col_change, row_change
+from game import Game
+from strategies.minmax_strategy import MinmaxStrategy, DEPTH, WEIGHTS_PATH
+
+# Patterns whose scores are tuned. Five in a row ends the game, so its score stays fixed
+TUNED_PATTERNS = [pattern for pattern in MinmaxStrategy.HEURISTIC_SCORES if pattern not in ('+++++', '-----')]
+# Factor between the fitted weights, in logistic units, and the integer scores used by MinmaxStrategy
+WEIGHT_SCALE = 1000
+
+# Cell values of the encoded boards, from the point of view of the player at move
+EMPTY, OWN, OTHER, OUTSIDE = 0, 1, 2, 3
+PATTERN_CHARACTERS = {' ': EMPTY, '+': OWN, '-': OTHER}
+# Lengths of the windows MinmaxStrategy.evaluate_line reads
+WINDOW_LENGTHS = [4, 5, 6]
+# Number of cells Board.get_line_of_characters reads on each side of a cell
+LINE_REACH = 7
+# Number of last moves whose lines are scored. The leaves of the search score the lines of the moves made since the
+# root, DEPTH being the depth its iterative deepening completes most often. The leaves of the other depths (from
+# DEPTH_STEP to MAX_DEPTH, plus the threat extensions) score the lines of more or fewer moves than the positions the
+# scores are fitted on, so the fit gives the values of the patterns near the last moves rather than exact leaf scores
+ANCHOR_MOVES = DEPTH
+NO_ANCHOR = -1
+# Number of random moves starting every self-play game, played in the square of this side around the center
+OPENING_MOVES = 4
+OPENING_SIDE = 5
+
+# Self-play records and weights fitted on them. The fitted weights are only copied to WEIGHTS_PATH, where
+# MinmaxStrategy loads them, once they beat HEURISTIC_SCORES in play_match, which they do not yet. The records
+# were played, and the weights fitted, by "python tuning.py --self-play 150 --seed 1" on an empty records file, and
+# "python tuning.py --seed 2 --match 20" then gives the fitted weights 13 wins, 26 losses and 1 draw: the games
+# are decided by the threats the engine blocks, so an open three of the other player, always blocked in the records,
+# is fitted as a small loss and then left open
+TUNING_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tuning_data')
+RECORDS_PATH = os.path.join(TUNING_DATA_PATH, 'self_play_games.txt')
+TUNED_WEIGHTS_PATH = os.path.join(TUNING_DATA_PATH, 'weights.json')
+
+
+def read_game_records(path):
+    """
+    Reads game records. Every line is a game: the winner ('B', 'W' or 'D' for a draw)
+    followed by the moves as "row,column", separated by spaces. Black moves first
+    :param path: path of the records file
+    :return: list of (winner, moves) tuples, the winner being Player.BLACK, Player.WHITE or Player.NONE
+             and the moves a list of (row,column) tuples
+    """
+    winners = {'B': Player.BLACK, 'W': Player.WHITE, 'D': Player.NONE}
+    games = []
+
+    with open(path) as records_file:
+        for line in records_file:
+            fields = line.split()
+            if not fields:
+                continue
+            moves = [tuple(int(value) for value in move.split(',')) for move in fields[1:]]
+            games.append((winners[fields[0]], moves))
+
+    return games
+
+
+def write_game_record(records_file, winner, moves):
+    """
+    Appends a game to an open records file, in the format read by read_game_records
+    :param records_file: file opened for writing
+    :param winner: Player.BLACK, Player.WHITE or Player.NONE for a draw
+    :param moves: list of (row,column) tuples, Black moving first
+    """
+    winner_character = {Player.BLACK: 'B', Player.WHITE: 'W', Player.NONE: 'D'}[winner]
+    records_file.write(' '.join([winner_character] + [str(row) + ',' + str(column) for row, column in moves]) + '\n')
+
+
+def encode_positions(games, board_size=BOARD_SIZE, skipped_moves=4):
+    """
+    Replays the games and encodes every position from the point of view of the player at move.
+    The final position of every game is left out, since it is already decided
+    :param games: list of (winner, moves) tuples, as returned by read_game_records
+    :param board_size: integer
+    :param skipped_moves: integer, number of opening moves after which positions are kept
+    :return: tuple (boards, anchors, results). boards is an int8 array of shape (positions, board_size,
+             board_size) with EMPTY, OWN and OTHER values. anchors is an integer array of shape
+             (positions, ANCHOR_MOVES, 2) with the (row, column) of the last moves, NO_ANCHOR filling the
+             rows of the moves that were not made yet. results is a float array with 1 if the player at move
+             won, 0 if they lost and 0.5 for a draw
+    """
+    boards, anchors, results = [], [], []
+
+    for winner, moves in games:
+        # Cells are stored as 1 for Black and 2 for White, then swapped when White is at move
+        board = np.zeros((board_size, board_size), dtype=np.int8)
+
+        for index, (row, column) in enumerate(moves[:-1]):
+            board[row, column] = 1 if index % 2 == 0 else 2
+            if index + 1 < skipped_moves:
+                continue
+
+            black_at_move = index % 2 == 1
+            boards.append(board.copy() if black_at_move else np.choose(board, [EMPTY, OTHER, OWN]).astype(np.int8))
+            last_moves = moves[max(0, index + 1 - ANCHOR_MOVES):index + 1]
+            anchors.append([(NO_ANCHOR, NO_ANCHOR)] * (ANCHOR_MOVES - len(last_moves)) + last_moves)
+
+            if winner == Player.NONE:
+                results.append(0.5)
+            else:
+                results.append(1.0 if (winner == Player.BLACK) == black_at_move else 0.0)
+
+    return np.array(boards, dtype=np.int8).reshape(-1, board_size, board_size), \
+        np.array(anchors, dtype=np.int64).reshape(-1, ANCHOR_MOVES, 2), np.array(results)
+
+
+def extract_features(boards, anchors, patterns=TUNED_PATTERNS):
+    """
+    Counts, for every position, the patterns scored by MinmaxStrategy.evaluate_board with the anchors as the
+    moves so far: the lines through every anchor in the first 4 directions, read as by
+    Board.get_line_of_characters, a line through two anchors being counted twice. As in
+    MinmaxStrategy.evaluate_line, the windows ending at the last cell of a line are not counted.
+    All the positions are processed at once: the lines are gathered into one array and every window of a line
+    is encoded as a base 4 number, which is then compared with the code of every pattern
+    :param boards: array of shape (positions, size, size) with EMPTY, OWN and OTHER values
+    :param anchors: integer array of shape (positions, anchors, 2), as returned by encode_positions
+    :param patterns: list of strings with ' ', '+' and '-' characters
+    :return: float array of shape (positions, number of patterns)
+    """
+    lines = _anchor_lines(boards, anchors)
+    is_anchor = anchors[:, :, 0] != NO_ANCHOR
+    features = np.zeros((boards.shape[0], len(patterns)))
+
+    for length in WINDOW_LENGTHS:
+        codes = _window_codes(lines, length)
+
+        for index, pattern in enumerate(patterns):
+            if len(pattern) == length:
+                features[:, index] = ((codes == _pattern_code(pattern)).sum(axis=(2, 3)) * is_anchor).sum(axis=1)
+
+    return features
+
+
+def fit_weights(features, results, iterations=2000, learning_rate=0.1, regularization=1e-4):
+    """
+    Fits the pattern weights with logistic regression, by gradient descent on the log loss,
+    so that sigmoid(features @ weights) predicts the result of the player at move
+    :param features: array of shape (positions, patterns)
+    :param results: array of shape (positions,) with values in [0, 1]
+    :param iterations: integer, number of gradient descent steps
+    :param learning_rate: float
+    :param regularization: float, L2 penalty keeping rare patterns from getting huge weights
+    :return: float array of shape (patterns,)
+    """
+    weights = np.zeros(features.shape[1])
+    number_of_positions = max(1, features.shape[0])
+
+    for _ in range(iterations):
+        predictions = 1 / (1 + np.exp(-(features @ weights)))
+        gradient = features.T @ (predictions - results) / number_of_positions + regularization * weights
+        weights -= learning_rate * gradient
+
+    return weights
+
+
+def export_weights(weights, path=WEIGHTS_PATH, patterns=TUNED_PATTERNS):
+    """
+    Writes the weights as integer pattern scores, in the file loaded by MinmaxStrategy
+    :param weights: array of shape (patterns,)
+    :param path: path of the JSON file
+    :param patterns: list of the patterns the weights correspond to
+    """
+    scores = {pattern: int(round(weight * WEIGHT_SCALE)) for pattern, weight in zip(patterns, weights)}
+
+    with open(path, 'w') as weights_file:
+        json.dump(scores, weights_file, indent=4)
+
+
+def _pattern_code(pattern):
+    """
+    Encodes a pattern as a base 4 number, the first character being the least significant digit
+    :param pattern: string with ' ', '+' and '-' characters
+    :return: integer
+    """
+    return sum(PATTERN_CHARACTERS[character] * 4 ** index for index, character in enumerate(pattern))
+
+
+def _anchor_lines(boards, anchors):
+    """
+    Gathers the lines through the anchors, LINE_REACH cells on each side, in the first 4 directions of
+    row_change and col_change. The cells outside the board and the last cell of every line are OUTSIDE,
+    so that no window going past the board or ending at the last cell matches a pattern
+    :param boards: array of shape (positions, size, size) with EMPTY, OWN and OTHER values
+    :param anchors: integer array of shape (positions, anchors, 2), NO_ANCHOR rows giving unused lines
+    :return: int32 array of shape (positions, anchors, 4, 2 * LINE_REACH + 1)
+    """
+    padded = np.pad(boards, ((0, 0), (LINE_REACH, LINE_REACH), (LINE_REACH, LINE_REACH)), constant_values=OUTSIDE)
+    padded = padded.astype(np.int32)
+
+    offsets = np.arange(-LINE_REACH, LINE_REACH + 1)
+    row_steps = np.array(row_change[:4])[:, None] * offsets
+    column_steps = np.array(col_change[:4])[:, None] * offsets
+    cells = np.maximum(anchors, 0) + LINE_REACH
+
+    positions = np.arange(boards.shape[0])[:, None, None, None]
+    lines = padded[positions, cells[:, :, None, None, 0] + row_steps, cells[:, :, None, None, 1] + column_steps]
+
+    # The line ends at its last cell inside the board
+    last_cells = lines.shape[-1] - 1 - np.argmax(lines[..., ::-1] != OUTSIDE, axis=-1)
+    np.put_along_axis(lines, last_cells[..., None], OUTSIDE, axis=-1)
+    return lines
+
+
+def _window_codes(lines, length):
+    """
+    Encodes every window of the given length of the lines as a base 4 number.
+    Windows that contain OUTSIDE cells do not match any pattern
+    :param lines: int32 array whose last axis are the cells of the lines
+    :param length: integer, window length
+    :return: int32 array of the same shape, with one code for every window start on the last axis
+    """
+    starts = lines.shape[-1] - length + 1
+    codes = np.zeros(lines.shape[:-1] + (starts,), dtype=np.int32)
+    for index in range(length):
+        codes += lines[..., index:index + starts] * 4 ** index
+
+    return codes
+
+
+def play_games(path, number_of_games, strategy=None, seed=None):
+    """
+    Plays games of a strategy against itself and appends their records to a file.
+    Every game starts with OPENING_MOVES random moves near the center, so that the games differ
+    :param path: path of the records file
+    :param number_of_games: integer
+    :param strategy: class that implements Strategy abstract class, a quiet MinmaxStrategy by default
+    :param seed: optional integer, seed of the random opening moves
+    """
+    strategy = strategy if strategy is not None else MinmaxStrategy(verbose=False)
+    opening_random = random.Random(seed)
+
+    with open(path, 'a') as records_file:
+        for _ in range(number_of_games):
+            winner, moves = _play_game(_opening_moves(opening_random), strategy, strategy)
+            write_game_record(records_file, winner, moves)
+
+
+def play_match(strategy, reference_strategy, number_of_openings, seed=None):
+    """
+    Plays a strategy against a reference strategy. Every random opening, made as in play_games, is played twice,
+    the strategy playing Black in the first game and White in the second one
+    :param strategy: class that implements Strategy abstract class
+    :param reference_strategy: class that implements Strategy abstract class
+    :param number_of_openings: integer
+    :param seed: optional integer, seed of the random opening moves
+    :return: tuple (wins, losses, draws) of the strategy
+    """
+    opening_random = random.Random(seed)
+    wins, losses, draws = 0, 0, 0
+
+    for _ in range(number_of_openings):
+        opening = _opening_moves(opening_random)
+
+        for colour, black_strategy, white_strategy in [(Player.BLACK, strategy, reference_strategy),
+                                                        (Player.WHITE, reference_strategy, strategy)]:
+            winner, _ = _play_game(opening, black_strategy, white_strategy)
+            if winner == Player.NONE:
+                draws += 1
+            elif winner == colour:
+                wins += 1
+            else:
+                losses += 1
+
+    return wins, losses, draws
+
+
+def _opening_moves(opening_random):
+    """
+    Draws the random opening moves of a game
+    :param opening_random: random.Random object
+    :return: list of OPENING_MOVES (row,column) tuples, in the square of side OPENING_SIDE around the center
+    """
+    first_cell = (BOARD_SIZE - OPENING_SIDE) // 2
+    opening_cells = [(row, column) for row in range(first_cell, first_cell + OPENING_SIDE)
+                     for column in range(first_cell, first_cell + OPENING_SIDE)]
+    return opening_random.sample(opening_cells, OPENING_MOVES)
+
+
+def _play_game(opening, black_strategy, white_strategy):
+    """
+    Plays the opening moves and then the moves of the strategies until the game is over
+    :param opening: list of (row,column) tuples, Black moving first
+    :param black_strategy: class that implements Strategy abstract class
+    :param white_strategy: class that implements Strategy abstract class
+    :return: tuple (winner, moves), the winner being Player.BLACK, Player.WHITE or Player.NONE for a draw
+             and the moves a list of (row,column) tuples
+    """
+    game = Game(black_strategy)
+    moves = []
+    player_colour = Player.BLACK
+
+    for move in opening:
+        game.human_move(*move, player_colour)
+        moves.append(move)
+        player_colour = Player.WHITE if player_colour == Player.BLACK else Player.BLACK
+
+    while not game.is_game_finished:
+        strategy = black_strategy if player_colour == Player.BLACK else white_strategy
+        moves.append(strategy.make_move(game.board, player_colour))
+        player_colour = Player.WHITE if player_colour == Player.BLACK else Player.BLACK
+
+    return game.board.board_winner, moves
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tunes the MinmaxStrategy pattern scores from game records')
+    parser.add_argument('records', nargs='?', default=RECORDS_PATH, help='game records file, one game per line')
+    parser.add_argument('--self-play', type=int, default=0, metavar='GAMES',
+                        help='number of self-play games appended to the records file before tuning')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the random openings')
+    parser.add_argument('--output', default=TUNED_WEIGHTS_PATH,
+                        help='weights file, to be copied to ' + WEIGHTS_PATH + ' for MinmaxStrategy to load it')
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--match', type=int, default=0, metavar='OPENINGS',
+                        help='number of openings the fitted weights then play against HEURISTIC_SCORES')
+    arguments = parser.parse_args()
+
+    if arguments.self_play:
+        play_games(arguments.records, arguments.self_play, seed=arguments.seed)
+
+    position_boards, position_anchors, position_results = encode_positions(read_game_records(arguments.records))
+    fitted_weights = fit_weights(extract_features(position_boards, position_anchors), position_results,
+                                 arguments.iterations)
+    export_weights(fitted_weights, arguments.output)
+    print('Tuned ' + str(len(TUNED_PATTERNS)) + ' patterns on ' + str(len(position_results)) + ' positions')
+
+    if arguments.match:
+        match_result = play_match(MinmaxStrategy(arguments.output, verbose=False),
+                                  MinmaxStrategy(None, verbose=False), arguments.match, arguments.seed)
+        print('Fitted weights against HEURISTIC_SCORES: ' + str(match_result[0]) + ' wins, ' + str(match_result[1]) +
+              ' losses, ' + str(match_result[2]) + ' draws')
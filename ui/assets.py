@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+import pygame
+
+from constants import BLACK, BOARD_COLOUR
+
+IMAGE_PATH = 'ui_data/'
+
+# Fraction of the board side left empty around the grid
+BOARD_MARGIN_RATIO = 0.054
+
+# Maximum number of scaled surfaces kept, enough for the board, the pieces and the messages of the current
+# window size and the previous one, so that resizing through many sizes does not keep all of them
+SCALED_SURFACES_SIZE = 8
+
+# Process-wide caches, so that restarts and resizes do not decode or scale the same assets again.
+# The decoded images are all kept, the scaled surfaces are evicted least recently used first
+_images = {}
+_scaled_surfaces = OrderedDict()
+_fonts = {}
+
+
+def get_image(name, size):
+    """
+    Returns an image from the ui_data folder, scaled to the given size.
+    The file is decoded once, and the recently used sizes are kept scaled
+    :param name: file name, relative to the ui_data folder
+    :param size: tuple of two integers (width, height)
+    :return: pygame Surface with alpha, shared by all callers
+    """
+    key = (name, size)
+    if key not in _scaled_surfaces:
+        if name not in _images:
+            _images[name] = pygame.image.load(IMAGE_PATH + name).convert_alpha()
+        _add_scaled_surface(key, pygame.transform.smoothscale(_images[name], size))
+
+    return _get_scaled_surface(key)
+
+
+def get_board(board_size, side):
+    """
+    Returns a square surface with the grid of a board, drawn for the given number of lines and size
+    :param board_size: integer, number of lines of the grid
+    :param side: integer, width and height of the surface in pixels
+    :return: pygame Surface, shared by all callers
+    """
+    key = ('board', board_size, side)
+    if key not in _scaled_surfaces:
+        _add_scaled_surface(key, _draw_board(board_size, side))
+
+    return _get_scaled_surface(key)
+
+
+def get_font(name, size):
+    """
+    Returns a font from the ui_data folder, loaded once for every size
+    :param name: file name, relative to the ui_data folder
+    :param size: integer, font size
+    :return: pygame Font
+    """
+    key = (name, size)
+    if key not in _fonts:
+        _fonts[key] = pygame.font.Font(IMAGE_PATH + name, size)
+
+    return _fonts[key]
+
+
+def _add_scaled_surface(key, surface):
+    """
+    Adds a surface to the scaled surfaces cache, evicting the least recently used ones past SCALED_SURFACES_SIZE
+    :param key: hashable object
+    :param surface: pygame Surface
+    """
+    _scaled_surfaces[key] = surface
+    while len(_scaled_surfaces) > SCALED_SURFACES_SIZE:
+        _scaled_surfaces.popitem(last=False)
+
+
+def _get_scaled_surface(key):
+    """
+    Returns a cached surface and marks it as the most recently used
+    :param key: hashable object, present in the cache
+    :return: pygame Surface
+    """
+    _scaled_surfaces.move_to_end(key)
+    return _scaled_surfaces[key]
+
+
+def _draw_board(board_size, side):
+    """
+    Draws the background, the grid and the center point of a board
+    :param board_size: integer, number of lines of the grid
+    :param side: integer, width and height of the surface in pixels
+    :return: pygame Surface
+    """
+    surface = pygame.Surface((side, side)).convert()
+    surface.fill(pygame.Color(BOARD_COLOUR))
+
+    line_colour = pygame.Color(BLACK)
+    margin = side * BOARD_MARGIN_RATIO
+    cell = (side - 2 * margin) / (board_size - 1)
+    line_width = max(1, side // 400)
+
+    for index in range(board_size):
+        position = round(margin + index * cell)
+        # Every other line is drawn thicker, as on the original board image
+        width = line_width * 2 if index % 2 == 0 else line_width
+        pygame.draw.line(surface, line_colour, (round(margin), position), (round(side - margin), position), width)
+        pygame.draw.line(surface, line_colour, (position, round(margin)), (position, round(side - margin)), width)
+
+    center = round(margin + (board_size // 2) * cell)
+    pygame.draw.circle(surface, line_colour, (center, center), max(2, round(cell / 8)))
+
+    return surface
@@ -1,3 +1,6 @@
+import queue
+import threading
+
 import pygame
 from pygame.locals import *
 
@@ -7,12 +10,21 @@ from ui.renderer import GameRenderer
 
 
 class GUI:
-    def __init__(self, strategy):
-        self._game = Game(strategy)
+    def __init__(self, strategy, rules=None):
+        self._game = Game(strategy, rules)
         self._renderer = GameRenderer(self._game)
 
         self._waiting_for_restart = False
 
+        # The computer moves are computed on a separate thread, which reports back through this queue
+        self._engine_results = queue.Queue()
+        self._engine_thread = None
+        strategy.set_progress_callback(self.report_progress)
+
+    @property
+    def is_computer_thinking(self):
+        return self._engine_thread is not None
+
     def start_game(self):
         self._renderer.draw_board()
         self._game.restart()
@@ -30,6 +42,55 @@ class GUI:
             self._renderer.draw_message('Draw', game_over=True)
             print('Draw!')
 
+    def report_progress(self, depth, move, score):
+        """
+        Called by the strategy, on the engine thread, when it finds a better move
+        """
+        self._engine_results.put(('progress', depth, move))
+
+    def compute_computer_move(self):
+        """
+        Runs on the engine thread, computes the computer move and queues it.
+        An exception is queued too, so that the main loop always learns that the thread finished
+        """
+        try:
+            self._engine_results.put(('move', self._game.computer_move(Player.WHITE)))
+        except Exception as exception:
+            self._engine_results.put(('error', exception))
+
+    def start_computer_move(self):
+        self._renderer.draw_message('Waiting for computer')
+        self._engine_thread = threading.Thread(target=self.compute_computer_move, daemon=True)
+        self._engine_thread.start()
+
+    def process_engine_results(self):
+        """
+        Handles the messages queued by the engine thread, without waiting for new ones
+        """
+        while True:
+            try:
+                result = self._engine_results.get_nowait()
+            except queue.Empty:
+                return
+
+            if result[0] == 'progress':
+                _, depth, move = result
+                self._renderer.draw_message('Computer thinking: depth ' + str(depth) + ', best ' + str(move))
+            elif result[0] == 'error':
+                self._engine_thread.join()
+                self._engine_thread = None
+
+                print('Computer move failed: ' + repr(result[1]))
+                self._renderer.draw_message('Computer move failed')
+            else:
+                self._engine_thread.join()
+                self._engine_thread = None
+
+                row, column = result[1]
+                if row is not None and column is not None:
+                    self._renderer.place_piece_at_cell(row, column, Player.WHITE)
+                    self._renderer.draw_message('Your turn')
+
     def start(self):
         self.start_game()
 
@@ -41,7 +102,10 @@ class GUI:
                     if event.type == QUIT:
                         exit()
 
-                    elif event.type == MOUSEBUTTONDOWN:
+                    elif event.type == VIDEORESIZE:
+                        self._renderer.resize(event.w, event.h)
+
+                    elif event.type == MOUSEBUTTONDOWN and not self.is_computer_thinking:
                         # In case something was pressed
                         position = pygame.mouse.get_pos()
 
@@ -56,19 +120,16 @@ class GUI:
 
                                 if not self._game.is_game_finished:
                                     # Computer step
-                                    self._renderer.draw_message('Waiting for computer')
-                                    pygame.display.update()
-                                    row, column = self._game.computer_move(Player.WHITE)
-                                    if row is not None and column is not None:
-                                        self._renderer.place_piece_at_cell(row, column, Player.WHITE)
-                                        self._renderer.draw_message('Your turn')
-
-                if self._game.is_game_finished and not self._waiting_for_restart:
+                                    self.start_computer_move()
+
+                self.process_engine_results()
+
+                if self._game.is_game_finished and not self._waiting_for_restart and not self.is_computer_thinking:
                     self.draw_winner()
                     self._waiting_for_restart = True
 
                 # update
-                pygame.display.update()
+                self._renderer.update_display()
 
             except ValueError as exception:
                 print(exception)
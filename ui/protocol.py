@@ -0,0 +1,268 @@
+import sys
+
+from constants import BOARD_SIZE, Player
+from game import Game
+from rules import RULES, set_memory_limit
+from strategies.minmax_strategy import MinmaxStrategy
+
+NAME = 'gomokai'
+VERSION = '1.0'
+# Smallest board on which five in a row can be made
+MIN_BOARD_SIZE = 5
+# Part of the turn time given to the search, the rest covers the moves that are not searched and the I/O
+TIME_SHARE = 0.8
+# Number of moves the time left for the game is shared between, when it is shorter than the turn time
+EXPECTED_MOVES = 20
+# Part of the memory limit given to the engine caches, the rest is used by the interpreter itself,
+# and part of the engine share given to the rules caches, the strategy using the rest
+MEMORY_SHARE = 0.5
+RULES_MEMORY_SHARE = 0.125
+
+# Values of the third field of the BOARD command lines
+OWN_STONE, OPPONENT_STONE = '1', '2'
+# Bits of the INFO rule value
+EXACT_FIVE_RULE, RENJU_RULE = 1, 4
+
+
+class Protocol:
+    """
+    Text protocol used by the Gomocup tournament managers, read from an input stream and answered on an
+    output stream, one command per line. Moves are written as "x,y", x being the column and y the row.
+    The game is kept between commands, so every TURN only adds the two new pieces to the board
+    """
+    def __init__(self, strategy=None, input_stream=sys.stdin, output_stream=sys.stdout):
+        """
+        Initializes the protocol
+        :param strategy: MinmaxStrategy object, a quiet MinmaxStrategy by default
+        :param input_stream: text stream the commands are read from
+        :param output_stream: text stream the answers are written to
+        """
+        self._strategy = strategy if strategy is not None else MinmaxStrategy(verbose=False)
+        self._input_stream = input_stream
+        self._output_stream = output_stream
+
+        self._rules = RULES['freestyle']
+        self._game = Game(self._strategy, self._rules)
+        # Colour of the engine, decided by the first BEGIN, TURN or BOARD command of the game
+        self._colour = None
+        self._turn_time = None
+        self._time_left = None
+        self._is_running = True
+
+        self._commands = {
+            'START': self.start_game,
+            'RESTART': self.restart_game,
+            'BEGIN': self.begin,
+            'TURN': self.turn,
+            'BOARD': self.board,
+            'INFO': self.info,
+            'ABOUT': self.about,
+            'END': self.end,
+        }
+
+    @property
+    def game(self):
+        return self._game
+
+    @property
+    def colour(self):
+        return self._colour
+
+    def run(self):
+        """
+        Answers the commands until END is read or the input stream ends
+        """
+        while self._is_running:
+            line = self._input_stream.readline()
+            if not line:
+                break
+            self.execute(line)
+
+    def execute(self, line):
+        """
+        Runs one command
+        :param line: string, command name followed by its arguments
+        """
+        fields = line.split()
+        if not fields:
+            return
+
+        command = self._commands.get(fields[0].upper())
+        if command is None:
+            self.respond('UNKNOWN ' + fields[0])
+            return
+
+        try:
+            command(fields[1:])
+        except ValueError as exception:
+            self.respond('ERROR ' + str(exception))
+
+    def respond(self, message):
+        """
+        Writes one answer line, flushed at once since the manager waits for it
+        :param message: string
+        """
+        self._output_stream.write(message + '\n')
+        self._output_stream.flush()
+
+    def start_game(self, arguments):
+        """
+        START [size], makes an empty board of the given size
+        Raises ValueError if the size is not an integer of at least MIN_BOARD_SIZE
+        """
+        board_size = int(arguments[0]) if arguments else BOARD_SIZE
+        if board_size < MIN_BOARD_SIZE:
+            raise ValueError('Unsupported board size!')
+
+        self._game = Game(self._strategy, self._rules, board_size)
+        self._colour = None
+        self.respond('OK')
+
+    def restart_game(self, arguments):
+        """
+        RESTART, empties the board and keeps its size
+        """
+        self._game.restart()
+        self._colour = None
+        self.respond('OK')
+
+    def begin(self, arguments):
+        """
+        BEGIN, the engine plays the first move as Black
+        """
+        self._colour = Player.BLACK
+        self.play()
+
+    def turn(self, arguments):
+        """
+        TURN x,y, plays the opponent move and then the engine move.
+        The engine plays White if the game did not start with BEGIN
+        Raises ValueError if the move is not valid
+        """
+        if self._colour is None:
+            self._colour = Player.WHITE
+        column, row = parse_coordinates(arguments)
+        self._game.human_move(row, column, self.opponent_colour)
+        self.play()
+
+    def board(self, arguments):
+        """
+        BOARD, followed by lines "x,y,field" and DONE, sets up a whole position and plays the engine move.
+        The engine plays Black when both players have the same number of pieces.
+        All the lines up to DONE are read first, so an invalid line gets a single answer
+        Raises ValueError if a line is not valid
+        """
+        lines = []
+        line = self._input_stream.readline()
+        while line and line.strip().upper() != 'DONE':
+            lines.append(line.strip())
+            line = self._input_stream.readline()
+
+        stones = []
+        for line in lines:
+            fields = line.split(',')
+            if len(fields) != 3:
+                raise ValueError('Invalid board line!')
+            stones.append((*parse_coordinates([','.join(fields[:2])]), fields[2]))
+
+        own_stones = sum(1 for stone in stones if stone[2] == OWN_STONE)
+        opponent_stones = sum(1 for stone in stones if stone[2] == OPPONENT_STONE)
+        self._colour = Player.BLACK if own_stones == opponent_stones else Player.WHITE
+
+        self._game.restart()
+        for column, row, field in stones:
+            if field not in (OWN_STONE, OPPONENT_STONE):
+                continue
+            if not self._game.board.are_coordinates_valid(row, column):
+                raise ValueError('Coordinates out of range!')
+            if not self._game.board.is_cell_empty(row, column):
+                raise ValueError('Cell not empty!')
+            self._game.board.set(row, column, self._colour if field == OWN_STONE else self.opponent_colour)
+        self.play()
+
+    def info(self, arguments):
+        """
+        INFO key value, sets a limit of the engine. timeout_turn and time_left are in milliseconds,
+        max_memory in bytes, 0 meaning no limit, and rule is a bit field. Unknown keys are ignored,
+        without any answer
+        """
+        if len(arguments) < 2:
+            return
+        key, value = arguments[0].lower(), arguments[1]
+
+        if key == 'timeout_turn':
+            # 0 asks for the fastest moves, which the strategy plays with its shallowest search
+            self._turn_time = int(value) / 1000
+            self._strategy.set_time_limit(self.time_limit)
+        elif key == 'time_left':
+            self._time_left = int(value) / 1000
+            self._strategy.set_time_limit(self.time_limit)
+        elif key == 'max_memory' and int(value) > 0:
+            # The protocol drives the only engine of the process, so it also owns the rules caches
+            engine_memory = int(int(value) * MEMORY_SHARE)
+            set_memory_limit(int(engine_memory * RULES_MEMORY_SHARE))
+            self._strategy.set_memory_limit(engine_memory - int(engine_memory * RULES_MEMORY_SHARE))
+        elif key == 'rule':
+            rule = int(value)
+            if rule & RENJU_RULE:
+                self._rules = RULES['renju']
+            elif rule & EXACT_FIVE_RULE:
+                self._rules = RULES['standard']
+            else:
+                self._rules = RULES['freestyle']
+            if not self._game.board.get_filled_cells():
+                self._game = Game(self._strategy, self._rules, self._game.board.board_size)
+
+    def about(self, arguments):
+        """
+        ABOUT, describes the engine
+        """
+        self.respond('name="' + NAME + '", version="' + VERSION + '"')
+
+    def end(self, arguments):
+        """
+        END, stops reading commands
+        """
+        self._is_running = False
+
+    @property
+    def opponent_colour(self):
+        return Player.WHITE if self._colour == Player.BLACK else Player.BLACK
+
+    @property
+    def time_limit(self):
+        """
+        Getter, number of seconds the engine may search for one move
+        :return: float or None if there is no limit
+        """
+        limits = []
+        if self._turn_time is not None:
+            limits.append(self._turn_time)
+        if self._time_left is not None:
+            limits.append(self._time_left / EXPECTED_MOVES)
+        return min(limits) * TIME_SHARE if limits else None
+
+    def play(self):
+        """
+        Computes the engine move and answers it
+        Raises ValueError if the game is already over
+        """
+        if self._game.is_game_finished:
+            raise ValueError('Game is over!')
+        row, column = self._game.computer_move(self._colour)
+        self.respond(str(column) + ',' + str(row))
+
+
+def parse_coordinates(arguments):
+    """
+    Reads the "x,y" argument of a command
+    :param arguments: list of strings, the first one being "x,y"
+    :return: tuple of two integers (x, y)
+    Raises ValueError if the argument is missing or not two integers
+    """
+    if not arguments:
+        raise ValueError('Missing coordinates!')
+    values = arguments[0].split(',')
+    if len(values) != 2:
+        raise ValueError('Invalid coordinates!')
+    return int(values[0]), int(values[1])
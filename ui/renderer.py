@@ -1,17 +1,16 @@
 import pygame
 
-from constants import Player, BLACK, GRAY, WHITE
-
-IMAGE_PATH = 'ui_data/'
+from constants import Player, GRAY, WHITE
+from ui.assets import BOARD_MARGIN_RATIO, get_board, get_font, get_image
 
 BOARD_WIDTH = 500
 BOARD_HEIGHT = 500
 MESSAGE_BOX_HEIGHT = 100
-MARGIN = 27
-CELL = (BOARD_WIDTH - 2 * MARGIN) / 10
-PIECE = 40
+# Size of a piece, relative to the distance between two lines of the grid
+PIECE_RATIO = 0.9
 BUTTON_WIDTH = 190
 BUTTON_HEIGHT = 40
+FRAME_RATE = 30
 
 
 class GameRenderer:
@@ -21,29 +20,55 @@ class GameRenderer:
         # initialize pygame
         pygame.init()
 
-        self.__font = pygame.font.Font(r'ui_data/cmu.ttf', 24)
+        self.__font = get_font('cmu.ttf', 24)
 
-        self.__screen = pygame.display.set_mode([BOARD_WIDTH, BOARD_HEIGHT + MESSAGE_BOX_HEIGHT])
+        self.__screen = pygame.display.set_mode([BOARD_WIDTH, BOARD_HEIGHT + MESSAGE_BOX_HEIGHT], pygame.RESIZABLE)
         pygame.display.set_caption('Gomokai')
-
-        self.__game_over_message_box = GameInfoBox(pygame.Rect(0, BOARD_HEIGHT, BOARD_WIDTH, MESSAGE_BOX_HEIGHT),
-                                                   self.__font)
-        self.__game_over_message_box.draw_empty(self.__screen)
-        self.__game_over_message_box.draw_replay_button(self.__screen)
-
-        self.__ui_chessboard = pygame.image.load(IMAGE_PATH + '11_board_dark.png').convert()
-        self.__ui_chessboard = pygame.transform.scale(self.__ui_chessboard, (BOARD_WIDTH, BOARD_HEIGHT))
-        self.__ui_piece_black = pygame.image.load(IMAGE_PATH + 'piece_black.png').convert_alpha()
-        self.__ui_piece_black = pygame.transform.smoothscale(self.__ui_piece_black, (PIECE, PIECE))
-        self.__ui_piece_white = pygame.image.load(IMAGE_PATH + 'piece_white.png').convert_alpha()
-        self.__ui_piece_white = pygame.transform.smoothscale(self.__ui_piece_white, (PIECE, PIECE))
-
-    @staticmethod
-    def coordinate_transform_map2pixel(row, column):
-        return MARGIN + column * CELL - PIECE / 2, MARGIN + row * CELL - PIECE / 2
+        self.__clock = pygame.time.Clock()
+
+        # Areas of the screen drawn since the last display update
+        self.__dirty_rectangles = []
+
+        self.__message = ''
+        self.__game_over = False
+        self.resize(BOARD_WIDTH, BOARD_HEIGHT + MESSAGE_BOX_HEIGHT)
+
+    def resize(self, width, height):
+        """
+        Computes the layout for the given window size and redraws the whole window.
+        The board is kept square and the message box takes the bottom of the window
+        :param width: integer, window width in pixels
+        :param height: integer, window height in pixels
+        """
+        if self.__screen.get_size() != (width, height):
+            self.__screen = pygame.display.set_mode([width, height], pygame.RESIZABLE)
+
+        board_size = self._game.board.board_size
+        self.__board_side = max(1, min(width, height - MESSAGE_BOX_HEIGHT))
+        self.__margin = self.__board_side * BOARD_MARGIN_RATIO
+        self.__cell = (self.__board_side - 2 * self.__margin) / (board_size - 1)
+        self.__piece = max(1, int(self.__cell * PIECE_RATIO))
+
+        self.__ui_board = get_board(board_size, self.__board_side)
+        self.__ui_piece_black = get_image('piece_black.png', (self.__piece, self.__piece))
+        self.__ui_piece_white = get_image('piece_white.png', (self.__piece, self.__piece))
+
+        self.__game_over_message_box = GameInfoBox(pygame.Rect(0, height - MESSAGE_BOX_HEIGHT, width,
+                                                               MESSAGE_BOX_HEIGHT), self.__font)
+
+        self.__screen.fill(pygame.Color(GRAY))
+        self.__dirty_rectangles = [self.__screen.get_rect()]
+        self.draw_board()
+        for row, column in self._game.board.get_filled_cells():
+            self.place_piece_at_cell(row, column, self._game.board.get_cell_value(row, column))
+        self.draw_message(self.__message, self.__game_over)
+
+    def coordinate_transform_map2pixel(self, row, column):
+        return self.__margin + column * self.__cell - self.__piece / 2, \
+               self.__margin + row * self.__cell - self.__piece / 2
 
     def coordinate_transform_pixel2map(self, x, y):
-        (row, column) = (int(y // CELL), int(x // CELL))
+        (row, column) = (round((y - self.__margin) / self.__cell), round((x - self.__margin) / self.__cell))
 
         if row < 0 or row >= self._game.board.board_size or column < 0 or column >= self._game.board.board_size:
             return None, None
@@ -51,7 +76,7 @@ class GameRenderer:
             return row, column
 
     def draw_board(self):
-        self.__screen.blit(self.__ui_chessboard, (0, 0))
+        self.__dirty_rectangles.append(self.__screen.blit(self.__ui_board, (0, 0)))
 
     def place_piece_at_cell(self, row, column, player):
         x_coordinate, y_coordinate = self.coordinate_transform_map2pixel(row, column)
@@ -59,16 +84,30 @@ class GameRenderer:
 
     def place_piece_at_coordinates(self, x_coordinate, y_coordinate, player):
         if player == Player.BLACK:
-            self.__screen.blit(self.__ui_piece_black, (x_coordinate, y_coordinate))
+            self.__dirty_rectangles.append(self.__screen.blit(self.__ui_piece_black, (x_coordinate, y_coordinate)))
         elif player == Player.WHITE:
-            self.__screen.blit(self.__ui_piece_white, (x_coordinate, y_coordinate))
+            self.__dirty_rectangles.append(self.__screen.blit(self.__ui_piece_white, (x_coordinate, y_coordinate)))
 
     def draw_message(self, message, game_over=False):
+        self.__message, self.__game_over = message, game_over
         self.__game_over_message_box.draw_message(self.__screen, message)
 
         if game_over:
             self.__game_over_message_box.draw_replay_button(self.__screen)
 
+        self.__dirty_rectangles.append(self.__game_over_message_box.rectangle)
+
+    def update_display(self):
+        """
+        Copies to the display only the areas drawn since the last update,
+        then waits so that the display is not updated more than FRAME_RATE times per second
+        """
+        if self.__dirty_rectangles:
+            pygame.display.update(self.__dirty_rectangles)
+            self.__dirty_rectangles = []
+
+        self.__clock.tick(FRAME_RATE)
+
     def was_play_again_pressed(self):
         return self.__game_over_message_box.was_pressed()
 
@@ -80,10 +119,14 @@ class GameInfoBox:
         self.__background_colour = pygame.Color(GRAY)
         self.__text_colour = pygame.Color(WHITE)
 
-        self.done_button = UIImageButton([self.__rectangle[0] + (self.__rectangle[2] / 2) - BUTTON_WIDTH // 2,
+        self.done_button = UIImageButton([self.__rectangle[0] + self.__rectangle[2] // 2 - BUTTON_WIDTH // 2,
                                           self.__rectangle[1] + self.__rectangle[3] - BUTTON_HEIGHT - 10,
                                           BUTTON_WIDTH, BUTTON_HEIGHT], 'play_again.png')
 
+    @property
+    def rectangle(self):
+        return self.__rectangle
+
     def was_pressed(self):
         return self.done_button.was_pressed()
 
@@ -113,8 +156,7 @@ class GameInfoBox:
 
 class UIImageButton:
     def __init__(self, rectangle, path_to_image):
-        self.__image = pygame.transform.scale(pygame.image.load(IMAGE_PATH + path_to_image).convert_alpha(),
-                                              (rectangle[2], rectangle[3]))
+        self.__image = get_image(path_to_image, (rectangle[2], rectangle[3]))
         self.__rectangle = pygame.Rect(rectangle)
 
     def was_pressed(self):
@@ -4,8 +4,8 @@ from strategies.random_strategy import RandomStrategy
 
 
 class UI:
-    def __init__(self, strategy):
-        self._game = Game(strategy)
+    def __init__(self, strategy, rules=None):
+        self._game = Game(strategy, rules)
 
     @staticmethod
     def read_human_move():